@@ -1,20 +1,131 @@
+from typing import Dict, Iterator, List, Optional, TYPE_CHECKING
+
 from game.state import GameState
 from game.piece import Color
-from ai.minimax import MinimaxAI
+from ai.minimax import MinimaxAI, SearchResult
+from ai.time_manager import Clock, TimeManager
+
+if TYPE_CHECKING:
+    from ai.nnue import Network
 
 
 class ChessAI:
-    def __init__(self, color: Color, depth: int = 3):
+    def __init__(
+        self,
+        color: Color,
+        depth: int = 3,
+        null_move: bool = True,
+        late_move_reductions: bool = True,
+        futility_pruning: bool = True,
+        see_pruning: bool = True,
+        clock: Optional[Clock] = None,
+        network: Optional["Network"] = None,
+    ):
         self.color = color
         self.depth = depth
-        self.ai = MinimaxAI(depth=self.depth)
+        self.ai = MinimaxAI(
+            depth=self.depth,
+            null_move=null_move,
+            late_move_reductions=late_move_reductions,
+            futility_pruning=futility_pruning,
+            see_pruning=see_pruning,
+            network=network,
+        )
+        self.time_manager = TimeManager(clock)
+
+    def new_game(self):
+        """
+        Resets the search state kept between moves (transposition table,
+        history, killers and principal variation).
+        """
+        self.ai.new_game()
+
+    @property
+    def nodes(self) -> int:
+        """
+        Nodes searched for the last move (to compare the search toggles).
+        """
+        return self.ai.nodes
+
+    def statistics(self) -> Dict[str, float]:
+        """
+        Search statistics: nodes of the last move, and the hit rates of
+        the transposition table, pawn table and evaluation cache.
+        """
+        return self.ai.statistics()
 
-    def choose_move(self, state: GameState):
+    def choose_move(
+        self,
+        state: GameState,
+        remaining: Optional[float] = None,
+        increment: float = 0.0,
+        moves_to_go: Optional[int] = None,
+        move_time: Optional[float] = None,
+    ):
         """
         Returns the best move for this AI's color given the current GameState.
+
+        Without time arguments the search runs to `self.depth`. With
+        `remaining` (seconds on our clock, plus `increment` and
+        `moves_to_go` if known) or a fixed `move_time`, the search
+        deepens until its time allocation runs out or `self.depth` is
+        reached, whichever comes first.
+        """
+        result = self.search(state, remaining, increment, moves_to_go, move_time)
+        return result.move if result else None
+
+    def search(
+        self,
+        state: GameState,
+        remaining: Optional[float] = None,
+        increment: float = 0.0,
+        moves_to_go: Optional[int] = None,
+        move_time: Optional[float] = None,
+    ) -> Optional[SearchResult]:
+        """
+        Like choose_move, but returns the full result: best move, score
+        and principal variation.
         """
         # Ensure the AI only chooses moves for its own color
         if state.turn != self.color:
             return None
 
-        return self.ai.choose_move(state)
+        return self.ai.search(state, self._start_clock(remaining, increment, moves_to_go, move_time))
+
+    def analyse(
+        self,
+        state: GameState,
+        lines: int = 3,
+        remaining: Optional[float] = None,
+        increment: float = 0.0,
+        moves_to_go: Optional[int] = None,
+        move_time: Optional[float] = None,
+    ) -> Iterator[List[SearchResult]]:
+        """
+        Multi-PV analysis of the position for the side to move (either
+        color): yields the `lines` best moves with their scores and
+        principal variations after each completed iteration, so the
+        last list yielded is the deepest. Depth and time limits as in
+        choose_move.
+
+            for results in ai.analyse(state, lines=3, move_time=5.0):
+                for result in results:
+                    print(result.depth, result.score, result.pv)
+        """
+        time_manager = self._start_clock(remaining, increment, moves_to_go, move_time)
+        return self.ai.analyse(state, lines, time_manager)
+
+    def _start_clock(
+        self,
+        remaining: Optional[float],
+        increment: float,
+        moves_to_go: Optional[int],
+        move_time: Optional[float],
+    ) -> Optional[TimeManager]:
+        if move_time is not None:
+            self.time_manager.start_fixed(move_time)
+        elif remaining is not None:
+            self.time_manager.start(remaining, increment, moves_to_go)
+        else:
+            return None
+        return self.time_manager
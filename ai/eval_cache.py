@@ -0,0 +1,41 @@
+from typing import List, Optional
+
+
+class EvalCache:
+    """
+    Fixed-size cache of static evaluations, indexed by the position's
+    Zobrist hash.
+
+    The same leaf is often reached through different move orders, and
+    stand-pat and futility checks evaluate the same node more than once.
+    Each slot holds a single score, so keys and scores are kept in two
+    flat lists rather than as entry objects.
+    """
+
+    def __init__(self, size: int = 1 << 16):
+        self.size = size
+        self.keys: List[Optional[int]] = [None] * size
+        self.scores: List[float] = [0.0] * size
+
+        # Statistics
+        self.probes = 0
+        self.hits = 0
+
+    def clear(self):
+        self.keys = [None] * self.size
+        self.scores = [0.0] * self.size
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key: int) -> Optional[float]:
+        self.probes += 1
+        index = key % self.size
+        if self.keys[index] == key:
+            self.hits += 1
+            return self.scores[index]
+        return None
+
+    def store(self, key: int, score: float):
+        index = key % self.size
+        self.keys[index] = key
+        self.scores[index] = score
@@ -1,5 +1,8 @@
+from typing import Dict, List, Optional, Tuple
+
 from game.piece import PieceType, Color
-from game.game_state import GameState
+from game.state import GameState
+from ai.pawn_table import PawnTable
 
 
 class Evaluator:
@@ -13,8 +16,18 @@ class Evaluator:
         PieceType.KING: 0,  # king value handled via checkmate
     }
 
+    # Score of a checkmated position, from the winner's point of view
+    MATE_SCORE = 9999
+
+    # Pawn structure terms (in pawns)
+    DOUBLED_PAWN_PENALTY = 0.15
+    ISOLATED_PAWN_PENALTY = 0.15
+    BACKWARD_PAWN_PENALTY = 0.1
+    # Passed pawn bonus by number of ranks advanced from the starting rank
+    PASSED_PAWN_BONUS = [0.0, 0.05, 0.1, 0.2, 0.35, 0.6, 1.0]
+
     @staticmethod
-    def evaluate(state: GameState) -> float:
+    def evaluate(state: GameState, pawn_table: Optional[PawnTable] = None) -> float:
         """
         Positive score = White advantage
         Negative score = Black advantage
@@ -25,14 +38,116 @@ class Evaluator:
         if not legal_moves:
             if state.is_in_check(state.turn):
                 # Current player is checkmated
-                return -9999 if state.turn == Color.WHITE else 9999
+                return -Evaluator.MATE_SCORE if state.turn == Color.WHITE else Evaluator.MATE_SCORE
             else:
                 # Stalemate
                 return 0
 
+        if state.is_insufficient_material():
+            return 0
+
+        return Evaluator.static_eval(state, pawn_table)
+
+    @staticmethod
+    def static_eval(state: GameState, pawn_table: Optional[PawnTable] = None) -> float:
+        """
+        Material plus pawn structure (White positive), without the mate check.
+
+        Pawn terms are looked up in `pawn_table` by the position's pawn
+        hash when a table is given, and computed (and stored) on a miss.
+        """
+        if pawn_table is None:
+            pawn_score = Evaluator.pawn_structure(state)[0]
+        else:
+            entry = pawn_table.probe(state.pawn_hash)
+            if entry is None:
+                entry = pawn_table.store(state.pawn_hash, *Evaluator.pawn_structure(state))
+            pawn_score = entry.score
+
+        return Evaluator.material(state) + pawn_score
+
+    @staticmethod
+    def pawn_structure(state: GameState) -> Tuple[float, int, int]:
+        """
+        Scores doubled, isolated, backward and passed pawns (White positive).
+
+        Returns the score and bitmasks (bit row * 8 + col) of the white
+        and black passed pawns.
+        """
+        # Rows of each side's pawns, by file
+        files: Dict[Color, List[List[int]]] = {
+            Color.WHITE: [[] for _ in range(8)],
+            Color.BLACK: [[] for _ in range(8)],
+        }
+        for row in range(8):
+            for col in range(8):
+                piece = state.board.grid[row][col]
+                if piece and piece.type == PieceType.PAWN:
+                    files[piece.color][col].append(row)
+
+        score = 0.0
+        passed_masks = {Color.WHITE: 0, Color.BLACK: 0}
+
+        for color in (Color.WHITE, Color.BLACK):
+            own = files[color]
+            enemy = files[color.opposite()]
+            forward = -1 if color == Color.WHITE else 1
+            start_row = 6 if color == Color.WHITE else 1
+            side_score = 0.0
+
+            for col in range(8):
+                if not own[col]:
+                    continue
+
+                side_score -= Evaluator.DOUBLED_PAWN_PENALTY * (len(own[col]) - 1)
+
+                adjacent = [c for c in (col - 1, col + 1) if 0 <= c < 8]
+                isolated = not any(own[c] for c in adjacent)
+
+                for row in own[col]:
+                    if isolated:
+                        side_score -= Evaluator.ISOLATED_PAWN_PENALTY
+
+                    # Passed: no enemy pawn in front on this or an adjacent file
+                    passed = not any(
+                        (r - row) * forward > 0
+                        for c in [col] + adjacent
+                        for r in enemy[c]
+                    )
+                    if passed:
+                        side_score += Evaluator.PASSED_PAWN_BONUS[(row - start_row) * forward]
+                        passed_masks[color] |= 1 << (row * 8 + col)
+                        continue
+
+                    # Backward: every neighbour is ahead, and the square in
+                    # front is covered by an enemy pawn
+                    if not isolated and all(
+                        (r - row) * forward > 0
+                        for c in adjacent
+                        for r in own[c]
+                    ):
+                        stop_row = row + forward
+                        if any(
+                            r == stop_row + forward
+                            for c in adjacent
+                            for r in enemy[c]
+                        ):
+                            side_score -= Evaluator.BACKWARD_PAWN_PENALTY
+
+            score += side_score if color == Color.WHITE else -side_score
+
+        return score, passed_masks[Color.WHITE], passed_masks[Color.BLACK]
+
+    @staticmethod
+    def material(state: GameState) -> float:
+        """
+        Material balance only (White positive), without the mate check.
+
+        Cheap enough for the search to use as a static estimate when
+        deciding whether a node is worth searching.
+        """
         score = 0.0
 
-        # Material evaluation
         for row in range(8):
             for col in range(8):
                 piece = state.board.get_piece((row, col))
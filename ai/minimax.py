@@ -1,86 +1,733 @@
-from typing import Optional
+from typing import AbstractSet, Dict, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
 import math
 
 from game.state import GameState
 from game.move import Move
-from game.piece import Color
-from ai.evaluator import Evaluator  # Use your evaluation module
+from game.piece import Color, PieceType
+from ai.evaluation import Evaluator  # Use your evaluation module
+from ai.move_ordering import order_moves, move_key, MovePicker
+from ai.transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from ai.pawn_table import PawnTable
+from ai.eval_cache import EvalCache
+from ai.time_manager import TimeManager, SearchTimeout
+
+if TYPE_CHECKING:
+    from ai.nnue import Network
+
+# Width of the zero-window searches used to test a bound
+NULL_WINDOW = 1e-3
+
+# Aspiration windows: initial half-width (in pawns) around the previous
+# iteration's score, and how much it grows after each failed search
+ASPIRATION_WINDOW = 0.5
+ASPIRATION_GROWTH = 2.0
+ASPIRATION_MAX = 8.0
+
+# Null-move pruning: depth reduction and minimum depth to try it at
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_MIN_DEPTH = 3
+
+# Late move reductions: moves searched at full depth before reducing
+LMR_FULL_DEPTH_MOVES = 3
+LMR_MIN_DEPTH = 3
+
+# Futility pruning: margin (in pawns) by remaining depth
+FUTILITY_MARGINS = {1: 1.0, 2: 3.0}
+
+# Killer moves remembered per ply
+KILLERS_PER_PLY = 2
+
+# Absolute depth limit, whatever the engine's depth setting
+MAX_SEARCH_DEPTH = 64
+
+# Mate scores are MATE_SCORE minus the ply of the mate (from the root),
+# so shorter mates score higher. Anything this close to MATE_SCORE is a
+# mate score; plies beyond the limit only occur in quiescence.
+MAX_MATE_PLY = 1000
+MATE_THRESHOLD = Evaluator.MATE_SCORE - MAX_MATE_PLY
+
+# Nodes between two looks at the clock
+TIME_CHECK_INTERVAL = 128
+
+
+class SearchResult:
+    """
+    Outcome of a search: the best move, its score (White positive, like
+    Evaluator) and the principal variation starting with that move.
+    """
+
+    def __init__(self, move: Optional[Move], score: float, pv: List[Move], depth: int, nodes: int):
+        self.move = move
+        self.score = score
+        self.pv = pv
+        self.depth = depth
+        self.nodes = nodes
+
+    def __repr__(self):
+        return (
+            f"SearchResult(move={self.move}, score={self.score}, "
+            f"depth={self.depth}, nodes={self.nodes}, pv_length={len(self.pv)})"
+        )
 
 
 class MinimaxAI:
-    def __init__(self, depth: int = 3):
+    def __init__(
+        self,
+        depth: int = 3,
+        null_move: bool = True,
+        late_move_reductions: bool = True,
+        futility_pruning: bool = True,
+        see_pruning: bool = True,
+        network: Optional["Network"] = None,
+    ):
         self.depth = depth
 
+        # Optional NNUE network (ai.nnue) used instead of Evaluator
+        self.network = network
+
+        # Selective search toggles
+        self.null_move = null_move
+        self.late_move_reductions = late_move_reductions
+        self.futility_pruning = futility_pruning
+        self.see_pruning = see_pruning
+
+        # Nodes visited by the last search (all, and quiescence only)
+        self.nodes = 0
+        self.qnodes = 0
+
+        # Best move of the previous iteration, keyed by position hash,
+        # so each iteration searches the principal variation first
+        self._pv_moves: Dict[int, Tuple] = {}
+
+        # Everything below is carried from one move to the next within a
+        # game (see new_game)
+        self.tt = TranspositionTable()
+        self.pawn_table = PawnTable()
+        self.eval_cache = EvalCache()
+        self.history: Dict[Tuple, int] = {}
+        self.killers: List[List[Tuple]] = []
+
+        # Root position expected on our next turn if the opponent plays
+        # the reply predicted by the principal variation
+        self._expected_hash: Optional[int] = None
+
+        self.last_result: Optional[SearchResult] = None
+
+        # Time manager of the running search, once it may be interrupted
+        self._time_manager: Optional[TimeManager] = None
+
+    def new_game(self):
+        """
+        Forgets everything learned during the previous game.
+        """
+        self.tt.clear()
+        self.pawn_table.clear()
+        self.eval_cache.clear()
+        self.history = {}
+        self.killers = []
+        self._pv_moves = {}
+        self._expected_hash = None
+        self.last_result = None
+        self.nodes = 0
+        self.qnodes = 0
+
     # ---------------- Public API ----------------
-    def choose_move(self, state: GameState) -> Optional[Move]:
+    def choose_move(self, state: GameState, time_manager: Optional[TimeManager] = None) -> Optional[Move]:
         """
-        Chooses the best move for the current turn using minimax with alpha-beta pruning.
+        Chooses the best move for the current turn.
         """
-        best_move: Optional[Move] = None
-        maximizing = state.turn == Color.WHITE
-        best_score = -math.inf if maximizing else math.inf
+        return self.search(state, time_manager).move
+
+    def search(self, state: GameState, time_manager: Optional[TimeManager] = None) -> SearchResult:
+        """
+        Iterative deepening up to `self.depth`. Every iteration after the
+        first starts with an aspiration window around the previous score
+        and widens it gradually when the result falls outside.
+
+        With a started `time_manager` the search is also limited by time:
+        iterations stop early when the time manager says so (`self.depth`
+        remains the upper limit), and an iteration still running at the
+        hard limit is abandoned in favour of the last completed one.
+
+        Consecutive calls within a game share the transposition table,
+        history and killers. If the opponent answered with the reply from
+        our last principal variation, the search resumes from that line
+        instead of starting again at depth 1.
+        """
+        sign = 1 if state.turn == Color.WHITE else -1
+        self._new_search()
+
+        seeded = (
+            self.last_result is not None
+            and self._expected_hash == state.zobrist_hash
+        )
+        max_depth = min(self.depth, MAX_SEARCH_DEPTH)
+        if seeded:
+            start_depth = min(max_depth, max(1, self.last_result.depth - 2))
+            score = sign * self.last_result.score
+        else:
+            self._pv_moves = {}
+            start_depth = 1
+            score = 0.0
+
+        root_moves = self._ordered_moves(state, state.get_legal_moves(), 0)
+        forced = len(root_moves) == 1
+
+        # Until an iteration completes, fall back on the best guess so far
+        result = SearchResult(root_moves[0] if root_moves else None, 0.0, root_moves[:1], 0, 0)
+
+        attach_network = self._attach(state, time_manager)
+        move_count, null_move_count = len(state.move_history), state.null_move_count
+        try:
+            for depth in range(start_depth, max_depth + 1):
+                try:
+                    if depth == start_depth and not seeded:
+                        score, pv = self._search_root(state, depth, -math.inf, math.inf)
+                    else:
+                        score, pv = self._aspiration_search(state, depth, score)
+                except SearchTimeout:
+                    state.unwind(move_count, null_move_count)
+                    break
+
+                if not pv:
+                    break  # no legal moves
+
+                result = SearchResult(pv[0], sign * score, pv, depth, self.nodes)
+                self._remember_pv(state, pv)
+
+                if time_manager is not None and time_manager.iteration_finished(
+                    move_key(pv[0]), score, forced
+                ):
+                    break
+        finally:
+            self._detach(state, attach_network)
+        self.last_result = result
+        return result
+
+    def analyse(
+        self, state: GameState, lines: int = 3, time_manager: Optional[TimeManager] = None
+    ) -> Iterator[List[SearchResult]]:
+        """
+        Multi-PV analysis: yields, after each completed iteration, the
+        `lines` best root moves (best first), each with its score (White
+        positive) and principal variation.
+
+        Within an iteration, each line is a root search that skips the
+        moves of the lines already found, so it reuses the transposition
+        table filled by those searches instead of starting over. Each
+        line keeps its own aspiration window from the previous iteration.
+
+        Depth and time limits work as in search(). The position must not
+        be changed between two results; closing the generator early
+        leaves it as it was.
+        """
+        sign = 1 if state.turn == Color.WHITE else -1
+        self._new_search()
+        self._pv_moves = {}
+
+        root_moves = state.get_legal_moves()
+        lines = min(lines, len(root_moves))
+        forced = len(root_moves) == 1
+        max_depth = min(self.depth, MAX_SEARCH_DEPTH)
+        previous_scores: List[float] = []
+
+        attach_network = self._attach(state, time_manager)
+        move_count, null_move_count = len(state.move_history), state.null_move_count
+        try:
+            for depth in range(1, max_depth + 1):
+                found: List[Tuple[float, List[Move]]] = []
+                excluded: Set[Tuple] = set()
+                try:
+                    for line in range(lines):
+                        if line < len(previous_scores):
+                            score, pv = self._aspiration_search(
+                                state, depth, previous_scores[line], excluded
+                            )
+                        else:
+                            score, pv = self._search_root(state, depth, -math.inf, math.inf, excluded)
+                        if not pv:
+                            break
+                        found.append((score, pv))
+                        excluded.add(move_key(pv[0]))
+                except SearchTimeout:
+                    state.unwind(move_count, null_move_count)
+                    return
+
+                if not found:
+                    return  # no legal moves
+
+                # Later lines can occasionally outscore earlier ones
+                found.sort(key=lambda line: line[0], reverse=True)
+                previous_scores = [score for score, _ in found]
+                self._remember_pv(state, found[0][1])
+
+                results = [
+                    SearchResult(pv[0], sign * score, pv, depth, self.nodes) for score, pv in found
+                ]
+                self.last_result = results[0]
+                yield results
+
+                if time_manager is not None and time_manager.iteration_finished(
+                    move_key(found[0][1][0]), found[0][0], forced
+                ):
+                    return
+        finally:
+            self._detach(state, attach_network)
+
+    def _new_search(self):
+        self.nodes = 0
+        self.qnodes = 0
+        self.tt.new_search()
+        self._age_history()
+        # Two plies have been played since the last search
+        self.killers = self.killers[2:]
+
+    def _attach(self, state: GameState, time_manager: Optional[TimeManager]) -> bool:
+        """
+        Sets up a search of `state`: the time manager, and the network's
+        accumulator, which then follows the search's moves. Returns True
+        if an accumulator was attached.
+        """
+        self._time_manager = time_manager
+        if self.network is None or state.accumulator is not None:
+            return False
+        state.accumulator = self.network.accumulator(state)
+        return True
+
+    def _detach(self, state: GameState, attached_network: bool):
+        self._time_manager = None
+        if attached_network:
+            state.accumulator = None
+
+    def statistics(self) -> Dict[str, float]:
+        """
+        Node count of the last search and hit rates of the caches.
+        Cache counters accumulate over the game (until new_game).
+        """
+        return {
+            "nodes": self.nodes,
+            "qnodes": self.qnodes,
+            "tt_probes": self.tt.probes,
+            "tt_hits": self.tt.hits,
+            "tt_hit_rate": self.tt.hits / self.tt.probes if self.tt.probes else 0.0,
+            "pawn_probes": self.pawn_table.probes,
+            "pawn_hits": self.pawn_table.hits,
+            "pawn_hit_rate": (
+                self.pawn_table.hits / self.pawn_table.probes if self.pawn_table.probes else 0.0
+            ),
+            "eval_probes": self.eval_cache.probes,
+            "eval_hits": self.eval_cache.hits,
+            "eval_hit_rate": (
+                self.eval_cache.hits / self.eval_cache.probes if self.eval_cache.probes else 0.0
+            ),
+        }
+
+    # ---------------- Root Search ----------------
+    def _aspiration_search(
+        self, state: GameState, depth: int, previous_score: float, excluded: AbstractSet[Tuple] = frozenset()
+    ) -> Tuple[float, List[Move]]:
+        delta = ASPIRATION_WINDOW
+        alpha, beta = previous_score - delta, previous_score + delta
+
+        while True:
+            score, pv = self._search_root(state, depth, alpha, beta, excluded)
+
+            if score <= alpha:
+                alpha = -math.inf if delta >= ASPIRATION_MAX else score - delta
+            elif score >= beta:
+                beta = math.inf if delta >= ASPIRATION_MAX else score + delta
+            else:
+                return score, pv
+
+            delta *= ASPIRATION_GROWTH
+
+    def _search_root(
+        self, state: GameState, depth: int, alpha: float, beta: float, excluded: AbstractSet[Tuple] = frozenset()
+    ) -> Tuple[float, List[Move]]:
+        """
+        Principal variation search over the root moves, except those whose
+        keys are in `excluded`. Returns the score from the side to move's
+        point of view and the principal variation (empty if no move was
+        searched).
+        """
+        best_score = -math.inf
+        best_pv: List[Move] = []
+        alpha_orig = alpha
+
+        entry = self.tt.probe(state.zobrist_hash)
+        hash_move = entry.move_key if entry else None
 
-        for move in state.get_legal_moves():
+        moves = self._ordered_moves(state, state.get_legal_moves(), 0, hash_move)
+        if excluded:
+            moves = [move for move in moves if move_key(move) not in excluded]
+
+        for index, move in enumerate(moves):
+            child_pv: List[Move] = []
             state.make_move(move)
-            score = self._minimax(
-                state,
-                depth=self.depth - 1,
-                alpha=-math.inf,
-                beta=math.inf,
-                maximizing=not maximizing,  # next level
-            )
+            if index == 0:
+                score = -self._negamax(state, depth - 1, -beta, -alpha, 1, child_pv)
+            else:
+                score = -self._negamax(state, depth - 1, -alpha - NULL_WINDOW, -alpha, 1, child_pv)
+                if alpha < score < beta:
+                    child_pv = []
+                    score = -self._negamax(state, depth - 1, -beta, -alpha, 1, child_pv)
             state.undo_move()
 
-            if maximizing and score > best_score:
+            if score > best_score:
                 best_score = score
-                best_move = move
-            elif not maximizing and score < best_score:
-                best_score = score
-                best_move = move
+                best_pv = [move] + child_pv
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
 
-        return best_move
+        # With moves excluded, the best score is not the position's score
+        if best_pv and not excluded:
+            self._store(state, depth, 0, best_score, alpha_orig, beta, best_pv[0])
+        return best_score, best_pv
 
-    # ---------------- Minimax Core ----------------
-    def _minimax(
+    # ---------------- Negamax Core ----------------
+    def _negamax(
         self,
         state: GameState,
         depth: int,
         alpha: float,
         beta: float,
-        maximizing: bool
+        ply: int,
+        pv: List[Move],
+        allow_null: bool = True,
     ) -> float:
         """
-        Recursively evaluates moves using minimax with alpha-beta pruning.
+        Principal variation search in negamax form: scores are always from
+        the side to move's point of view. The first move is searched with
+        the full window and the rest with a zero window, re-searching only
+        those that turn out to improve alpha. The best line found is
+        written into `pv`.
         """
-        # Terminal conditions
-        if depth == 0 or state.is_checkmate() or state.is_stalemate():
-            return Evaluator.evaluate(state)
+        self.nodes += 1
+        self._check_time()
+
+        # Drawn by repetition, the fifty-move rule or lack of mating
+        # material: no need to search further. A single repetition inside
+        # the tree is enough, the side that can avoid it would already
+        # have done so.
+        if state.is_fifty_move_draw() or state.is_repetition() or state.is_insufficient_material():
+            return 0.0
+
+        sign = 1 if state.turn == Color.WHITE else -1
+
+        if depth <= 0:
+            return self._quiescence(state, alpha, beta, ply)
+
+        is_pv_node = beta - alpha > 2 * NULL_WINDOW
+
+        # ---------------- Mate Distance Pruning ----------------
+        # Neither side can do better than mating at the next ply or worse
+        # than being mated here: when a shorter mate is already known
+        # elsewhere, the window closes and the subtree is skipped.
+        alpha = max(alpha, -Evaluator.MATE_SCORE + ply)
+        beta = min(beta, Evaluator.MATE_SCORE - ply - 1)
+        if alpha >= beta:
+            return alpha
+        alpha_orig = alpha
+
+        # ---------------- Transposition Table ----------------
+        entry = self.tt.probe(state.zobrist_hash)
+        hash_move = None
+        if entry is not None:
+            hash_move = entry.move_key
+            if entry.depth >= depth and not is_pv_node:
+                score = self._score_from_tt(entry.score, ply)
+                if entry.flag == EXACT:
+                    return score
+                if entry.flag == LOWER_BOUND and score >= beta:
+                    return score
+                if entry.flag == UPPER_BOUND and score <= alpha:
+                    return score
+
+        in_check = state.is_in_check(state.turn)
+
+        # ---------------- Null-Move Pruning ----------------
+        # Give the opponent a free move: if we still beat the bound with a
+        # reduced search, a real move will too. Unsafe in check and in
+        # pawn endings, where zugzwang makes passing the best "move".
+        if (
+            self.null_move
+            and allow_null
+            and not is_pv_node
+            and depth >= NULL_MOVE_MIN_DEPTH
+            and not in_check
+            and self._has_non_pawn_material(state, state.turn)
+        ):
+            state.make_null_move()
+            score = -self._negamax(
+                state, depth - 1 - NULL_MOVE_REDUCTION,
+                -beta, -beta + NULL_WINDOW, ply + 1, [], allow_null=False,
+            )
+            state.undo_null_move()
 
-        legal_moves = state.get_legal_moves()
-        if not legal_moves:
-            return Evaluator.evaluate(state)
+            if score >= beta:
+                return beta
 
-        if maximizing:
-            max_eval = -math.inf
-            for move in legal_moves:
-                state.make_move(move)
-                eval_score = self._minimax(state, depth - 1, alpha, beta, False)
+        # ---------------- Futility Pruning ----------------
+        # Near the leaves, quiet moves cannot lift a hopeless static score
+        # back over alpha, so they are skipped (unless they give check).
+        futile = False
+        if self.futility_pruning and depth in FUTILITY_MARGINS and not in_check:
+            futile = sign * self._static_eval(state) + FUTILITY_MARGINS[depth] <= alpha
+
+        best = -math.inf
+        best_move: Optional[Move] = None
+        legal = 0
+        searched = 0
+        for move in self._move_picker(state, ply, hash_move):
+            quiet = not move.is_capture() and not move.is_promotion()
+
+            state.make_move(move)
+            if state.leaves_king_in_check():
                 state.undo_move()
+                continue
+            legal += 1
+            gives_check = state.is_in_check(state.turn)
+
+            if futile and quiet and not gives_check:
+                state.undo_move()
+                continue
+
+            child_pv: List[Move] = []
+            if searched == 0:
+                score = -self._negamax(state, depth - 1, -beta, -alpha, ply + 1, child_pv)
+            else:
+                # Late move reductions: quiet moves ordered late are first
+                # searched one ply shallower
+                reduction = 0
+                if (
+                    self.late_move_reductions
+                    and quiet
+                    and searched >= LMR_FULL_DEPTH_MOVES
+                    and depth >= LMR_MIN_DEPTH
+                    and not in_check
+                    and not gives_check
+                ):
+                    reduction = 1
+
+                score = -self._negamax(
+                    state, depth - 1 - reduction,
+                    -alpha - NULL_WINDOW, -alpha, ply + 1, child_pv,
+                )
+                if score > alpha and reduction:
+                    child_pv = []
+                    score = -self._negamax(
+                        state, depth - 1, -alpha - NULL_WINDOW, -alpha, ply + 1, child_pv,
+                    )
+                if alpha < score < beta:
+                    child_pv = []
+                    score = -self._negamax(state, depth - 1, -beta, -alpha, ply + 1, child_pv)
+            state.undo_move()
+            searched += 1
+
+            if score > best:
+                best = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+                pv[:] = [move] + child_pv
+            if alpha >= beta:
+                if quiet:
+                    self._record_cutoff(move, depth, ply)
+                break  # Beta cutoff
+
+        if legal == 0:
+            # Checkmate or stalemate
+            return -(Evaluator.MATE_SCORE - ply) if in_check else 0.0
 
-                max_eval = max(max_eval, eval_score)
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break  # Alpha-Beta pruning
-            return max_eval
+        if searched == 0:
+            # Every move was pruned as futile: fail low on the static score
+            return sign * self._static_eval(state)
+
+        self._store(state, depth, ply, best, alpha_orig, beta, best_move)
+        return best
+
+    # ---------------- Quiescence ----------------
+    def _quiescence(self, state: GameState, alpha: float, beta: float, ply: int) -> float:
+        """
+        Extends the leaves with captures (and every evasion when in check)
+        until the position is quiet, so the score is never taken in the
+        middle of an exchange. Captures that lose material by SEE are
+        skipped (unless in check).
+        """
+        self.nodes += 1
+        self.qnodes += 1
+        self._check_time()
+        if state.is_insufficient_material():
+            return 0.0
+        sign = 1 if state.turn == Color.WHITE else -1
+
+        in_check = state.is_in_check(state.turn)
+        if in_check:
+            best = -math.inf
         else:
-            min_eval = math.inf
-            for move in legal_moves:
-                state.make_move(move)
-                eval_score = self._minimax(state, depth - 1, alpha, beta, True)
+            # Stand pat: the side to move may decline every capture
+            best = sign * self._static_eval(state)
+            if best >= beta:
+                return best
+            alpha = max(alpha, best)
+
+        picker = MovePicker(
+            state,
+            captures_only=not in_check,
+            skip_bad_captures=self.see_pruning and not in_check,
+        )
+        for move in picker:
+            state.make_move(move)
+            if state.leaves_king_in_check():
                 state.undo_move()
+                continue
+            score = -self._quiescence(state, -beta, -alpha, ply + 1)
+            state.undo_move()
+
+            if score > best:
+                best = score
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if best == -math.inf:
+            # In check with no way out
+            return -(Evaluator.MATE_SCORE - ply)
+        return best
+
+    # ---------------- Helpers ----------------
+    def _check_time(self):
+        # Reading the clock at every node would cost too much
+        if self._time_manager is not None and self.nodes % TIME_CHECK_INTERVAL == 0:
+            self._time_manager.check()
+
+    def _static_eval(self, state: GameState) -> float:
+        score = self.eval_cache.probe(state.zobrist_hash)
+        if score is None:
+            if self.network is not None:
+                score = self.network.evaluate(state)
+            else:
+                score = Evaluator.static_eval(state, self.pawn_table)
+            self.eval_cache.store(state.zobrist_hash, score)
+        return score
+
+    def _move_picker(self, state: GameState, ply: int, hash_move: Optional[Tuple]) -> MovePicker:
+        first, killers = self._ordering_hints(state, ply, hash_move)
+        return MovePicker(state, first, killers, self.history)
+
+    def _ordered_moves(
+        self, state: GameState, moves: List[Move], ply: int, hash_move: Optional[Tuple] = None
+    ) -> List[Move]:
+        first, killers = self._ordering_hints(state, ply, hash_move)
+        return order_moves(moves, first, killers, self.history, state)
+
+    def _ordering_hints(
+        self, state: GameState, ply: int, hash_move: Optional[Tuple]
+    ) -> Tuple[Optional[Tuple], List[Tuple]]:
+        """
+        The move to try first and the killers of `ply`. The principal
+        variation move from the previous iteration goes first, then the
+        transposition table's best move.
+        """
+        first = self._pv_moves.get(state.zobrist_hash, hash_move)
+        killers = self.killers[ply] if ply < len(self.killers) else []
+        return first, killers
+
+    def _store(
+        self,
+        state: GameState,
+        depth: int,
+        ply: int,
+        score: float,
+        alpha: float,
+        beta: float,
+        best_move: Optional[Move],
+    ):
+        if score <= alpha:
+            flag = UPPER_BOUND
+            best_move = None  # a fail-low doesn't know the best move
+        elif score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.tt.store(
+            state.zobrist_hash, depth, self._score_to_tt(score, ply), flag,
+            move_key(best_move) if best_move else None,
+        )
+
+    # Mate scores count plies from the root, but a position stored in the
+    # transposition table can be reached at any ply: store them relative
+    # to the position itself and convert back on probing
+    @staticmethod
+    def _score_to_tt(score: float, ply: int) -> float:
+        if score >= MATE_THRESHOLD:
+            return score + ply
+        if score <= -MATE_THRESHOLD:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _score_from_tt(score: float, ply: int) -> float:
+        if score >= MATE_THRESHOLD:
+            return score - ply
+        if score <= -MATE_THRESHOLD:
+            return score + ply
+        return score
+
+    def _record_cutoff(self, move: Move, depth: int, ply: int):
+        """
+        A quiet move caused a beta cutoff: remember it as a killer for
+        this ply and reward it in the history table.
+        """
+        key = move_key(move)
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if key not in killers:
+            killers.insert(0, key)
+            del killers[KILLERS_PER_PLY:]
+
+        self.history[key] = self.history.get(key, 0) + depth * depth
+
+    def _age_history(self):
+        # Halve history scores so older phases of the game fade out
+        self.history = {key: value // 2 for key, value in self.history.items() if value > 1}
+
+    def _remember_pv(self, state: GameState, pv: List[Move]):
+        self._pv_moves = {}
+        self._expected_hash = None
+        made = 0
+        for move in pv:
+            if made == 2:
+                self._expected_hash = state.zobrist_hash
+            key = move_key(move)
+            self._pv_moves[state.zobrist_hash] = key
+
+            # Replay with freshly generated moves: a move made by a piece
+            # promoted during the search refers to a piece that is gone
+            match = next((m for m in state.get_legal_moves() if move_key(m) == key), None)
+            if match is None:
+                break
+            state.make_move(match)
+            made += 1
+
+        if made == 2:
+            self._expected_hash = state.zobrist_hash
+
+        for _ in range(made):
+            state.undo_move()
 
-                min_eval = min(min_eval, eval_score)
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break  # Alpha-Beta pruning
-            return min_eval
+    @staticmethod
+    def _has_non_pawn_material(state: GameState, color: Color) -> bool:
+        for row in state.board.grid:
+            for piece in row:
+                if (
+                    piece
+                    and piece.color == color
+                    and piece.type not in (PieceType.PAWN, PieceType.KING)
+                ):
+                    return True
+        return False
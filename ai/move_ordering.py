@@ -1,9 +1,155 @@
+from typing import Dict, Iterable, Iterator, Optional, TYPE_CHECKING
+
 from game.move import Move
+from game.piece import PieceType
+from ai.evaluation import Evaluator
+from ai.see import is_good_capture
+
+if TYPE_CHECKING:
+    from game.state import GameState
+
+def order_moves(
+    moves: list[Move],
+    hash_move: Optional[tuple] = None,
+    killers: Iterable[tuple] = (),
+    history: Optional[Dict[tuple, int]] = None,
+    state: Optional["GameState"] = None,
+) -> list[Move]:
+    """
+    Sorts an already generated move list in MovePicker's order: the hash
+    move, captures and promotions by MVV-LVA, killer moves, then quiet
+    moves by history score. Given the position in `state`, captures that
+    lose material by SEE go last, as in MovePicker.
+    """
+    killers = tuple(killers)
+
+    def key(m: Move):
+        mk = move_key(m)
+        if mk == hash_move:
+            return (4, 0)
+        if m.is_capture() or m.is_promotion():
+            if state is not None and not is_good_capture(state, m):
+                return (0, mvv_lva(m))
+            return (3, mvv_lva(m))
+        if mk in killers:
+            return (2, -killers.index(mk))
+        return (1, history.get(mk, 0) if history else 0)
+
+    return sorted(moves, key=key, reverse=True)
+
 
-def order_moves(moves: list[Move]) -> list[Move]:
+def move_key(move: Move) -> tuple:
     """
-    Sort moves to try captures and promotions first.
+    Identifies a move independently of the Move object, so moves can be
+    matched across separate move generations.
+    """
+    return (move.start, move.end, move.promotion)
+
+
+def mvv_lva(move: Move) -> int:
+    """
+    Capture ordering score: most valuable victim first, and among equal
+    victims the least valuable attacker first. Queen promotions count
+    as winning a queen.
+    """
+    victim = Evaluator.PIECE_VALUES[move.captured.type] if move.captured else 0
+    if move.promotion == 'q':
+        victim += Evaluator.PIECE_VALUES[PieceType.QUEEN]
+    return 10 * victim - Evaluator.PIECE_VALUES[move.piece.type]
+
+
+class MovePicker:
     """
-    return sorted(moves, key=lambda m: (
-        m.is_promotion, m.is_capture()
-    ), reverse=True)
+    Produces the moves of the side to move in stages:
+
+    1. the hash move
+    2. captures and promotions that don't lose material, by MVV-LVA
+    3. killer moves
+    4. the remaining quiet moves, by history score
+    5. captures that lose material according to SEE
+
+    A stage is generated only once the previous one is exhausted, so a
+    cutoff on an early move skips the rest of the generation. Moves are
+    pseudo-legal: the caller makes each one and drops it if it leaves
+    the king in check (see GameState.leaves_king_in_check).
+
+    With `skip_bad_captures` the losing captures are never produced
+    (quiescence pruning).
+    """
+
+    def __init__(
+        self,
+        state: "GameState",
+        hash_move: Optional[tuple] = None,
+        killers: Iterable[tuple] = (),
+        history: Optional[Dict[tuple, int]] = None,
+        captures_only: bool = False,
+        skip_bad_captures: bool = False,
+    ):
+        self.state = state
+        self.hash_move = hash_move
+        self.killers = tuple(killers)
+        self.history = history
+        self.captures_only = captures_only
+        self.skip_bad_captures = skip_bad_captures
+
+    def __iter__(self) -> Iterator[Move]:
+        rules = self.state.rules
+        color = self.state.turn
+        seen = set()
+
+        # ---------------- Hash Move ----------------
+        if self.hash_move is not None:
+            move = self._find(self.hash_move, None)
+            if move and (not self.captures_only or move.is_capture() or move.is_promotion()):
+                seen.add(self.hash_move)
+                yield move
+
+        # ---------------- Good Captures ----------------
+        bad_captures = []
+        for move in sorted(rules.generate_captures(color), key=mvv_lva, reverse=True):
+            if move_key(move) in seen:
+                continue
+            if is_good_capture(self.state, move):
+                yield move
+            elif not self.skip_bad_captures:
+                bad_captures.append(move)
+
+        if self.captures_only:
+            yield from bad_captures
+            return
+
+        # ---------------- Killers ----------------
+        for killer in self.killers:
+            if killer in seen:
+                continue
+            move = self._find(killer, False)
+            if move:
+                seen.add(killer)
+                yield move
+
+        # ---------------- Quiet Moves ----------------
+        quiets = rules.generate_quiet_moves(color)
+        if self.history:
+            quiets.sort(key=lambda m: self.history.get(move_key(m), 0), reverse=True)
+        for move in quiets:
+            if move_key(move) not in seen:
+                yield move
+
+        # ---------------- Bad Captures ----------------
+        yield from bad_captures
+
+    def _find(self, key: tuple, tactical: Optional[bool]) -> Optional[Move]:
+        """
+        Rebuilds the move identified by `key` if it is pseudo-legal here,
+        generating only the moves of the piece on its start square.
+        """
+        start = key[0]
+        piece = self.state.board.get_piece(start)
+        if piece is None or piece.color != self.state.turn:
+            return None
+
+        for move in self.state.rules.get_piece_moves(piece, start, tactical):
+            if move_key(move) == key:
+                return move
+        return None
@@ -0,0 +1,343 @@
+"""
+Optional NNUE-style evaluation ("efficiently updatable neural network").
+
+The first layer is a feature transformer over 768 piece-square features
+(own/enemy x piece type x square), kept as two accumulators, one from
+each side's point of view. Making a move only adds and subtracts the
+weight rows of the few features it changes, instead of recomputing the
+layer. Two small clipped-ReLU layers and a linear output turn the
+accumulators into a score.
+
+Needs NumPy; without it the engine keeps using Evaluator. No trained
+network ships with the engine: load one with Network.load(), or use
+random_weights() (material plus noise) for testing and benchmarks.
+
+Weights are a .npz archive (or a directory of .npy files) holding:
+
+    ft_weight   (768, H)    ft_bias   (H,)
+    l1_weight   (2H, L1)    l1_bias   (L1,)
+    l2_weight   (L1, L2)    l2_bias   (L2,)
+    out_weight  (L2,)       out_bias  (1,)
+
+The output is in pawns from the side to move's point of view.
+"""
+from typing import Dict, List, TYPE_CHECKING
+import os
+import struct
+import zipfile
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from game.board import Board, Position
+from game.move import Move
+from game.piece import Color, Piece, PieceType
+from ai.evaluation import Evaluator
+
+if TYPE_CHECKING:
+    from game.state import GameState
+
+TYPE_INDEX = {
+    PieceType.PAWN: 0,
+    PieceType.KNIGHT: 1,
+    PieceType.BISHOP: 2,
+    PieceType.ROOK: 3,
+    PieceType.QUEEN: 4,
+    PieceType.KING: 5,
+}
+NUM_FEATURES = 2 * 6 * 64
+
+WEIGHT_NAMES = (
+    "ft_weight", "ft_bias",
+    "l1_weight", "l1_bias",
+    "l2_weight", "l2_bias",
+    "out_weight", "out_bias",
+)
+
+# Size of a zip local file header before its name and extra field
+_ZIP_LOCAL_HEADER = 30
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("NNUE evaluation needs NumPy (pip install numpy)")
+
+
+# --------------------------------------------------
+# Features
+# --------------------------------------------------
+def feature_index(perspective: Color, color: Color, piece_type: PieceType, square: int) -> int:
+    """
+    Index of a piece-square feature as seen by `perspective`. Black sees
+    the board flipped vertically, so both sides share the weights.
+    """
+    if perspective == Color.BLACK:
+        square ^= 56
+    side = 0 if color == perspective else 1
+    return (side * 6 + TYPE_INDEX[piece_type]) * 64 + square
+
+
+def active_features(board: Board, perspective: Color) -> List[int]:
+    features = []
+    for row in range(8):
+        for col in range(8):
+            piece = board.grid[row][col]
+            if piece:
+                features.append(feature_index(perspective, piece.color, piece.type, row * 8 + col))
+    return features
+
+
+# --------------------------------------------------
+# Weights
+# --------------------------------------------------
+def load_weights(path: str) -> Dict[str, "np.ndarray"]:
+    """
+    Loads network weights memory-mapped, so that processes sharing a
+    network share its pages. Accepts a directory of <name>.npy files or
+    an uncompressed .npz archive (compressed members are read into
+    memory instead).
+    """
+    require_numpy()
+    if os.path.isdir(path):
+        return {
+            name: np.load(os.path.join(path, name + ".npy"), mmap_mode="r")
+            for name in WEIGHT_NAMES
+        }
+    return _map_npz(path)
+
+
+def _map_npz(path: str) -> Dict[str, "np.ndarray"]:
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as handle:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[name] = np.load(member)
+                continue
+
+            # Skip the local header to the stored .npy, then past its header
+            handle.seek(info.header_offset)
+            local_header = handle.read(_ZIP_LOCAL_HEADER)
+            name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+            handle.seek(info.header_offset + _ZIP_LOCAL_HEADER + name_length + extra_length)
+
+            version = np.lib.format.read_magic(handle)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(handle)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(handle)
+
+            arrays[name] = np.memmap(
+                path, dtype=dtype, mode="r", offset=handle.tell(), shape=shape,
+                order="F" if fortran_order else "C",
+            )
+    return arrays
+
+
+def save_weights(path: str, weights: Dict[str, "np.ndarray"]):
+    """
+    Writes weights as an uncompressed .npz, which load_weights can map.
+    """
+    require_numpy()
+    np.savez(path, **{name: weights[name] for name in WEIGHT_NAMES})
+
+
+def random_weights(
+    hidden: int = 256, l1: int = 32, l2: int = 32, seed: int = 0, noise: float = 0.1
+) -> Dict[str, "np.ndarray"]:
+    """
+    Untrained weights for tests and benchmarks: one exact material
+    channel (Evaluator.PIECE_VALUES) plus random units whose effect on
+    the output is scaled by `noise`. A purely random network would make
+    quiescence search explode, since stand-pat would rarely cut off.
+    """
+    require_numpy()
+    rng = np.random.default_rng(seed)
+
+    def layer(inputs, outputs):
+        return rng.normal(0.0, 1.0 / np.sqrt(inputs), (inputs, outputs)).astype(np.float32)
+
+    weights = {
+        "ft_weight": rng.normal(0.0, 0.1, (NUM_FEATURES, hidden)).astype(np.float32),
+        "ft_bias": np.full(hidden, 0.5, dtype=np.float32),
+        "l1_weight": layer(2 * hidden, l1),
+        "l1_bias": np.zeros(l1, dtype=np.float32),
+        "l2_weight": layer(l1, l2),
+        "l2_bias": np.zeros(l2, dtype=np.float32),
+        "out_weight": layer(l2, 1)[:, 0] * noise,
+        "out_bias": np.zeros(1, dtype=np.float32),
+    }
+
+    # Unit 0 of each accumulator holds 0.5 + (own - enemy material) * scale,
+    # which stays inside the clipped ReLU's linear range; it is passed
+    # straight through both dense layers and rescaled to pawns
+    scale = 0.01
+    ft_weight, l1_weight, l2_weight = weights["ft_weight"], weights["l1_weight"], weights["l2_weight"]
+    for piece_type, index in TYPE_INDEX.items():
+        value = Evaluator.PIECE_VALUES[piece_type] * scale
+        ft_weight[index * 64:(index + 1) * 64, 0] = value
+        ft_weight[(6 + index) * 64:(7 + index) * 64, 0] = -value
+    l1_weight[:, 0] = 0.0
+    l1_weight[0, 0] = 1.0
+    l1_weight[0, 1:] = 0.0
+    l2_weight[:, 0] = 0.0
+    l2_weight[0, 0] = 1.0
+    l2_weight[0, 1:] = 0.0
+    weights["out_weight"][0] = 1.0 / scale
+    weights["out_bias"][0] = -0.5 / scale
+    return weights
+
+
+# --------------------------------------------------
+# Accumulator
+# --------------------------------------------------
+class Accumulator:
+    """
+    Feature transformer output for both perspectives (row 0: White,
+    row 1: Black), kept in step with a GameState.
+
+    Set as `state.accumulator`, it is updated by make_move and restored
+    by undo_move: each move pushes the current values and adds or
+    subtracts the weight rows of the features it changes.
+    """
+
+    def __init__(self, network: "Network", board: Board):
+        self.network = network
+        self.values = np.empty((2, network.hidden), dtype=np.float32)
+        self._stack: List["np.ndarray"] = []
+        self.refresh(board)
+
+    def refresh(self, board: Board):
+        """
+        Recomputes both accumulators from scratch.
+        """
+        weights = self.network.ft_weight
+        for row, perspective in enumerate((Color.WHITE, Color.BLACK)):
+            features = active_features(board, perspective)
+            self.values[row] = self.network.ft_bias + weights[features].sum(axis=0)
+
+    # ---------------- Incremental Updates ----------------
+    def push(self):
+        self._stack.append(self.values.copy())
+
+    def pop(self):
+        self.values = self._stack.pop()
+
+    def add(self, piece: Piece, pos: Position):
+        square = pos[0] * 8 + pos[1]
+        weights = self.network.ft_weight
+        self.values[0] += weights[feature_index(Color.WHITE, piece.color, piece.type, square)]
+        self.values[1] += weights[feature_index(Color.BLACK, piece.color, piece.type, square)]
+
+    def remove(self, piece: Piece, pos: Position):
+        square = pos[0] * 8 + pos[1]
+        weights = self.network.ft_weight
+        self.values[0] -= weights[feature_index(Color.WHITE, piece.color, piece.type, square)]
+        self.values[1] -= weights[feature_index(Color.BLACK, piece.color, piece.type, square)]
+
+    def apply_move(self, move: Move, board: Board):
+        """
+        Called by make_move once `move` is on the board.
+        """
+        self.push()
+        self.remove(move.piece, move.start)
+
+        if move.captured:
+            captured_pos = (move.start[0], move.end[1]) if move.is_en_passant else move.end
+            self.remove(move.captured, captured_pos)
+
+        if move.is_castling:
+            row = move.start[0]
+            if move.end[1] > move.start[1]:  # kingside
+                rook_start, rook_end = (row, 7), (row, 5)
+            else:  # queenside
+                rook_start, rook_end = (row, 0), (row, 3)
+            rook = board.get_piece(rook_end)
+            self.remove(rook, rook_start)
+            self.add(rook, rook_end)
+
+        # The piece now on the target square (the new piece after a promotion)
+        self.add(board.get_piece(move.end), move.end)
+
+
+# --------------------------------------------------
+# Network
+# --------------------------------------------------
+class Network:
+    def __init__(self, weights: Dict[str, "np.ndarray"]):
+        require_numpy()
+        missing = [name for name in WEIGHT_NAMES if name not in weights]
+        if missing:
+            raise ValueError(f"missing NNUE weights: {', '.join(missing)}")
+
+        self.ft_weight = weights["ft_weight"]
+        self.ft_bias = weights["ft_bias"]
+        self.l1_weight = weights["l1_weight"]
+        self.l1_bias = weights["l1_bias"]
+        self.l2_weight = weights["l2_weight"]
+        self.l2_bias = weights["l2_bias"]
+        self.out_weight = weights["out_weight"]
+        self.out_bias = weights["out_bias"]
+        self.hidden = self.ft_bias.shape[0]
+
+        if self.ft_weight.shape != (NUM_FEATURES, self.hidden):
+            raise ValueError(f"ft_weight must be {(NUM_FEATURES, self.hidden)}, got {self.ft_weight.shape}")
+        if self.l1_weight.shape[0] != 2 * self.hidden:
+            raise ValueError(f"l1_weight must have {2 * self.hidden} rows, got {self.l1_weight.shape[0]}")
+
+    @classmethod
+    def load(cls, path: str) -> "Network":
+        return cls(load_weights(path))
+
+    def accumulator(self, state: "GameState") -> Accumulator:
+        return Accumulator(self, state.board)
+
+    # ---------------- Evaluation ----------------
+    def forward(self, own: "np.ndarray", other: "np.ndarray") -> float:
+        """
+        Score in pawns for the side whose accumulator is `own`.
+        """
+        x = np.clip(np.concatenate((own, other)), 0.0, 1.0)
+        x = np.clip(x @ self.l1_weight + self.l1_bias, 0.0, 1.0)
+        x = np.clip(x @ self.l2_weight + self.l2_bias, 0.0, 1.0)
+        return float(x @ self.out_weight + self.out_bias[0])
+
+    def evaluate(self, state: "GameState") -> float:
+        """
+        Positive score = White advantage, like Evaluator.static_eval.
+
+        Uses the state's accumulator when it has one for this network,
+        otherwise builds a temporary one.
+        """
+        accumulator = state.accumulator
+        if accumulator is None or accumulator.network is not self:
+            accumulator = self.accumulator(state)
+        white, black = accumulator.values
+        if state.turn == Color.WHITE:
+            return self.forward(white, black)
+        return -self.forward(black, white)
+
+
+def reference_forward(weights: Dict[str, "np.ndarray"], state: "GameState") -> float:
+    """
+    The network's evaluation computed from scratch in float64, with
+    one-hot feature vectors and no accumulator: the reference that the
+    incremental evaluation is checked against. White positive.
+    """
+    require_numpy()
+    w = {name: np.asarray(weights[name], dtype=np.float64) for name in WEIGHT_NAMES}
+
+    def transform(perspective: Color) -> "np.ndarray":
+        features = np.zeros(NUM_FEATURES)
+        features[active_features(state.board, perspective)] = 1.0
+        return features @ w["ft_weight"] + w["ft_bias"]
+
+    own, other = transform(state.turn), transform(state.opponent(state.turn))
+    x = np.clip(np.concatenate((own, other)), 0.0, 1.0)
+    x = np.clip(x @ w["l1_weight"] + w["l1_bias"], 0.0, 1.0)
+    x = np.clip(x @ w["l2_weight"] + w["l2_bias"], 0.0, 1.0)
+    score = float(x @ w["out_weight"] + w["out_bias"][0])
+    return score if state.turn == Color.WHITE else -score
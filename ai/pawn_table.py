@@ -0,0 +1,49 @@
+from typing import List, Optional
+
+
+class PawnEntry:
+    __slots__ = ("key", "score", "white_passed", "black_passed")
+
+    def __init__(self, key: int, score: float, white_passed: int, black_passed: int):
+        self.key = key
+        self.score = score
+
+        # Bitmasks of passed pawn squares (bit row * 8 + col)
+        self.white_passed = white_passed
+        self.black_passed = black_passed
+
+
+class PawnTable:
+    """
+    Fixed-size cache of pawn-structure evaluations, indexed by the
+    position's pawn hash.
+
+    Pawn structure changes far less often than the rest of the position,
+    so most evaluations in a search find their pawn terms here.
+    """
+
+    def __init__(self, size: int = 1 << 14):
+        self.size = size
+        self.slots: List[Optional[PawnEntry]] = [None] * size
+
+        # Statistics
+        self.probes = 0
+        self.hits = 0
+
+    def clear(self):
+        self.slots = [None] * self.size
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key: int) -> Optional[PawnEntry]:
+        self.probes += 1
+        entry = self.slots[key % self.size]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key: int, score: float, white_passed: int, black_passed: int) -> PawnEntry:
+        entry = PawnEntry(key, score, white_passed, black_passed)
+        self.slots[key % self.size] = entry
+        return entry
@@ -0,0 +1,84 @@
+from typing import List, TYPE_CHECKING
+
+from game.move import Move
+from game.piece import PieceType
+from ai.evaluation import Evaluator
+
+if TYPE_CHECKING:
+    from game.state import GameState
+
+PROMOTION_TYPES = {
+    'q': PieceType.QUEEN,
+    'r': PieceType.ROOK,
+    'b': PieceType.BISHOP,
+    'n': PieceType.KNIGHT,
+}
+
+
+def see(state: "GameState", move: Move) -> float:
+    """
+    Static exchange evaluation: the material the side making `move` wins
+    (or loses, if negative) once both sides have finished recapturing on
+    the target square, always recapturing with their least valuable
+    attacker and stopping whenever continuing would lose material.
+
+    Nothing is moved on the board. Captured pieces are hidden from the
+    attacker scan instead, which also brings x-ray attackers into play.
+    Pins are ignored.
+    """
+    values = Evaluator.PIECE_VALUES
+    rules = state.rules
+    target = move.end
+
+    gain: List[float] = [values[move.captured.type] if move.captured else 0]
+    on_target = move.piece.type
+    if move.promotion:
+        on_target = PROMOTION_TYPES[move.promotion]
+        gain[0] += values[on_target] - values[PieceType.PAWN]
+
+    removed = {move.start}
+    if move.is_en_passant:
+        removed.add((move.start[0], move.end[1]))
+
+    side = move.piece.color.opposite()
+    while True:
+        attackers = rules.attackers(target, side, removed)
+        if not attackers:
+            break
+
+        pos = min(attackers, key=lambda p: _exchange_value(state.board.get_piece(p).type))
+        piece_type = state.board.get_piece(pos).type
+
+        # The king may only recapture if nothing can take it back
+        if piece_type == PieceType.KING and rules.attackers(target, side.opposite(), removed | {pos}):
+            break
+
+        # Capture what stands on the target; the capturer is now exposed
+        gain.append(values[on_target] - gain[-1])
+        on_target = piece_type
+        removed.add(pos)
+        side = side.opposite()
+
+    # Each side may stop the exchange when continuing would lose
+    for i in range(len(gain) - 1, 0, -1):
+        gain[i - 1] = -max(-gain[i - 1], gain[i])
+    return gain[0]
+
+
+def is_good_capture(state: "GameState", move: Move) -> bool:
+    """
+    True if `move` does not lose material according to SEE. Taking a
+    piece worth at least the capturer is good without running SEE.
+    """
+    values = Evaluator.PIECE_VALUES
+    if move.captured and not move.promotion:
+        if values[move.captured.type] >= _exchange_value(move.piece.type):
+            return True
+    return see(state, move) >= 0
+
+
+def _exchange_value(piece_type: PieceType) -> float:
+    # The king recaptures last, so it must sort after every other piece
+    if piece_type == PieceType.KING:
+        return float("inf")
+    return Evaluator.PIECE_VALUES[piece_type]
@@ -0,0 +1,169 @@
+from typing import Callable, Optional
+import time
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the hard time limit is reached (or a
+    stop is requested).
+    """
+
+
+# --------------------------------------------------
+# Clocks
+# --------------------------------------------------
+class Clock:
+    """
+    Source of the current time in seconds (monotonic).
+    """
+
+    def now(self) -> float:
+        return time.monotonic()
+
+
+class FakeClock(Clock):
+    """
+    Deterministic clock for tests: time only moves when advanced, or by
+    `tick` seconds every time it is read.
+    """
+
+    def __init__(self, start: float = 0.0, tick: float = 0.0):
+        self.time = start
+        self.tick = tick
+
+    def now(self) -> float:
+        current = self.time
+        self.time += self.tick
+        return current
+
+    def advance(self, seconds: float):
+        self.time += seconds
+
+
+# --------------------------------------------------
+# Time Manager
+# --------------------------------------------------
+class TimeManager:
+    """
+    Turns the game clock into time limits for one move.
+
+    The soft limit is the time the search would like to use. It is
+    stretched when the best move keeps changing or the score drops
+    between iterations, and shrunk when the best move is stable. The
+    search stops early if the only legal move is forced. The hard limit
+    is never exceeded: the search is aborted mid-iteration when it is
+    reached, or as soon as the optional `stop` callback returns True.
+    """
+
+    # Assumed number of moves left when the time control doesn't say
+    DEFAULT_MOVES_TO_GO = 30
+    # Share of the increment spent on this move
+    INCREMENT_USAGE = 0.75
+    # Hard limit as a multiple of the base allocation...
+    HARD_LIMIT_FACTOR = 4.0
+    # ...and as a share of the remaining time
+    MAX_TIME_USAGE = 0.5
+
+    # Soft limit scaling between iterations
+    INSTABILITY_FACTOR = 1.5
+    SCORE_DROP = 0.3  # pawns
+    SCORE_DROP_FACTOR = 1.3
+    STABLE_ITERATIONS = 3
+    STABLE_FACTOR = 0.8
+    MIN_SCALE = 0.5
+    MAX_SCALE = 3.0
+
+    # An iteration is only started if it has a fair chance to finish:
+    # don't start one past this fraction of the soft limit
+    NEXT_ITERATION_FRACTION = 0.6
+
+    def __init__(self, clock: Optional[Clock] = None, move_overhead: float = 0.05):
+        self.clock = clock or Clock()
+        # Safety margin for everything outside the search (UI, I/O, ...)
+        self.move_overhead = move_overhead
+        # Polled with the clock; True aborts the search like the hard limit
+        self.stop: Optional[Callable[[], bool]] = None
+
+        self.start_time = 0.0
+        self.soft_limit = 0.0
+        self.hard_limit = 0.0
+        self._reset_iteration_state()
+
+    def _reset_iteration_state(self):
+        self._scale = 1.0
+        self._best_move: Optional[tuple] = None
+        self._score: Optional[float] = None
+        self._stable_iterations = 0
+
+    # ---------------- Allocation ----------------
+    def start(self, remaining: float, increment: float = 0.0, moves_to_go: Optional[int] = None):
+        """
+        Starts timing a move with `remaining` seconds left on our clock.
+        """
+        self.start_time = self.clock.now()
+        self._reset_iteration_state()
+
+        moves = max(1, moves_to_go or self.DEFAULT_MOVES_TO_GO)
+        available = max(0.0, remaining - self.move_overhead)
+        base = remaining / moves + increment * self.INCREMENT_USAGE
+
+        if moves == 1:
+            hard = available
+        else:
+            hard = min(base * self.HARD_LIMIT_FACTOR, remaining * self.MAX_TIME_USAGE)
+        self.hard_limit = max(0.0, min(hard, available))
+        self.soft_limit = min(base, self.hard_limit)
+
+    def start_fixed(self, seconds: float):
+        """
+        Starts timing a move with a fixed budget (no clock to manage),
+        less the move overhead, as in start().
+        """
+        self.start_time = self.clock.now()
+        self._reset_iteration_state()
+        self.soft_limit = self.hard_limit = max(0.0, seconds - self.move_overhead)
+
+    # ---------------- During the Search ----------------
+    def elapsed(self) -> float:
+        return self.clock.now() - self.start_time
+
+    def hard_limit_reached(self) -> bool:
+        return self.elapsed() >= self.hard_limit
+
+    def stop_requested(self) -> bool:
+        return self.stop is not None and self.stop()
+
+    def check(self):
+        """
+        Raises SearchTimeout once the hard limit is reached or a stop is
+        requested.
+        """
+        if self.hard_limit_reached() or self.stop_requested():
+            raise SearchTimeout()
+
+    def iteration_finished(self, best_move: tuple, score: float, forced: bool = False) -> bool:
+        """
+        Records the result of a completed iteration (score from the side
+        to move's point of view) and returns True if the search should
+        stop rather than start another one.
+        """
+        if forced or self.stop_requested():
+            return True
+
+        if self._best_move is not None and best_move != self._best_move:
+            # The best move changed: the position needs more thought
+            self._scale = min(self._scale * self.INSTABILITY_FACTOR, self.MAX_SCALE)
+            self._stable_iterations = 0
+        else:
+            self._stable_iterations += 1
+            if self._stable_iterations >= self.STABLE_ITERATIONS:
+                self._scale = max(self._scale * self.STABLE_FACTOR, self.MIN_SCALE)
+
+        if self._score is not None and score < self._score - self.SCORE_DROP:
+            self._scale = min(self._scale * self.SCORE_DROP_FACTOR, self.MAX_SCALE)
+
+        self._best_move = best_move
+        self._score = score
+
+        target = min(self.soft_limit * self._scale, self.hard_limit)
+        return self.elapsed() >= target * self.NEXT_ITERATION_FRACTION
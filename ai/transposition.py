@@ -0,0 +1,74 @@
+from typing import List, Optional, Tuple
+
+# Bound types of a stored score
+EXACT = 0
+LOWER_BOUND = 1  # search failed high: true score >= stored score
+UPPER_BOUND = 2  # search failed low: true score <= stored score
+
+
+class TTEntry:
+    __slots__ = ("key", "depth", "score", "flag", "move_key", "generation")
+
+    def __init__(self, key: int, depth: int, score: float, flag: int, move_key: Optional[Tuple], generation: int):
+        self.key = key
+        self.depth = depth
+        self.score = score
+        self.flag = flag
+        self.move_key = move_key
+        self.generation = generation
+
+
+class TranspositionTable:
+    """
+    Fixed-size table of search results indexed by Zobrist hash.
+
+    Each slot holds one entry. A new result replaces the old one unless
+    the old one comes from the current search and was searched deeper,
+    so entries from earlier moves in the game are kept until the space
+    is needed.
+    """
+
+    def __init__(self, size: int = 1 << 18):
+        self.size = size
+        self.slots: List[Optional[TTEntry]] = [None] * size
+        self.generation = 0
+
+        # Statistics
+        self.probes = 0
+        self.hits = 0
+
+    def new_search(self):
+        """
+        Marks the start of a new search; older entries become replaceable.
+        """
+        self.generation += 1
+
+    def clear(self):
+        self.slots = [None] * self.size
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        self.probes += 1
+        entry = self.slots[key % self.size]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, score: float, flag: int, move_key: Optional[Tuple]):
+        index = key % self.size
+        entry = self.slots[index]
+        if (
+            entry is not None
+            and entry.generation == self.generation
+            and entry.depth > depth
+            and entry.key != key
+        ):
+            return  # keep the deeper result from this search
+
+        if entry is not None and entry.key == key and move_key is None:
+            move_key = entry.move_key  # don't forget a known best move
+
+        self.slots[index] = TTEntry(key, depth, score, flag, move_key, self.generation)
@@ -5,7 +5,11 @@ Position = Tuple[int, int]
 
 
 class Board:
-    def __init__(self):
+    def __init__(self, setup: bool = True):
+        """
+        Board with the starting position, or empty if not `setup` (the
+        king positions are then left for the caller to set).
+        """
         # 8x8 board
         self.grid: List[List[Optional[Piece]]] = [
             [None for _ in range(8)] for _ in range(8)
@@ -16,7 +20,8 @@ class Board:
 
         self.en_passant_target: Optional[Position] = None
 
-        self._setup_board()
+        if setup:
+            self._setup_board()
 
     # --------------------------------------------------
     # Initial Setup
@@ -28,16 +33,22 @@ class Board:
             self.grid[1][col] = Piece(PieceType.PAWN, Color.BLACK)
 
         # Rooks
-        self.grid[7][0] = self.grid[7][7] = Piece(PieceType.ROOK, Color.WHITE)
-        self.grid[0][0] = self.grid[0][7] = Piece(PieceType.ROOK, Color.BLACK)
+        self.grid[7][0] = Piece(PieceType.ROOK, Color.WHITE)
+        self.grid[7][7] = Piece(PieceType.ROOK, Color.WHITE)
+        self.grid[0][0] = Piece(PieceType.ROOK, Color.BLACK)
+        self.grid[0][7] = Piece(PieceType.ROOK, Color.BLACK)
 
         # Knights
-        self.grid[7][1] = self.grid[7][6] = Piece(PieceType.KNIGHT, Color.WHITE)
-        self.grid[0][1] = self.grid[0][6] = Piece(PieceType.KNIGHT, Color.BLACK)
+        self.grid[7][1] = Piece(PieceType.KNIGHT, Color.WHITE)
+        self.grid[7][6] = Piece(PieceType.KNIGHT, Color.WHITE)
+        self.grid[0][1] = Piece(PieceType.KNIGHT, Color.BLACK)
+        self.grid[0][6] = Piece(PieceType.KNIGHT, Color.BLACK)
 
         # Bishops
-        self.grid[7][2] = self.grid[7][5] = Piece(PieceType.BISHOP, Color.WHITE)
-        self.grid[0][2] = self.grid[0][5] = Piece(PieceType.BISHOP, Color.BLACK)
+        self.grid[7][2] = Piece(PieceType.BISHOP, Color.WHITE)
+        self.grid[7][5] = Piece(PieceType.BISHOP, Color.WHITE)
+        self.grid[0][2] = Piece(PieceType.BISHOP, Color.BLACK)
+        self.grid[0][5] = Piece(PieceType.BISHOP, Color.BLACK)
 
         # Queens
         self.grid[7][3] = Piece(PieceType.QUEEN, Color.WHITE)
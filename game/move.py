@@ -29,6 +29,8 @@ class Move:
         self.previous_en_passant = None
         self.previous_castling_rights = None
         self.previous_has_moved = False
+        self.previous_halfmove_clock = 0
+        self.previous_pawn_hash = 0
 
     # --------------------------------------------------
     # Utility
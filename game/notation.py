@@ -0,0 +1,168 @@
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+import re
+
+from game.board import Position
+from game.move import Move
+from game.piece import Color, PieceType
+
+if TYPE_CHECKING:
+    from game.state import GameState
+
+FILES = "abcdefgh"
+
+PIECE_LETTERS = {
+    PieceType.KNIGHT: 'N',
+    PieceType.BISHOP: 'B',
+    PieceType.ROOK: 'R',
+    PieceType.QUEEN: 'Q',
+    PieceType.KING: 'K',
+}
+LETTER_PIECES = {letter: piece_type for piece_type, letter in PIECE_LETTERS.items()}
+
+SAN_PATTERN = re.compile(
+    r"^(?P<piece>[NBRQK])?(?P<file>[a-h])?(?P<rank>[1-8])?x?"
+    r"(?P<end>[a-h][1-8])(?:=?(?P<promotion>[NBRQnbrq]))?[+#]?[!?]*$"
+)
+UCI_PATTERN = re.compile(r"^([a-h][1-8])([a-h][1-8])([nbrq])?$")
+
+
+# --------------------------------------------------
+# Squares
+# --------------------------------------------------
+def square_name(pos: Position) -> str:
+    row, col = pos
+    return f"{FILES[col]}{8 - row}"
+
+
+def parse_square(name: str) -> Position:
+    return (8 - int(name[1]), FILES.index(name[0].lower()))
+
+
+# --------------------------------------------------
+# Legal Move Index
+# --------------------------------------------------
+class MoveIndex:
+    """
+    The legal moves of a position, indexed for constant-time lookup by
+    UCI key (start, end, promotion) and by SAN target (piece type, end).
+    """
+
+    def __init__(self, state: "GameState"):
+        self.moves = state.get_legal_moves()
+        self.by_key: Dict[Tuple, Move] = {}
+        self.by_target: Dict[Tuple[PieceType, Position], List[Move]] = {}
+
+        for move in self.moves:
+            self.by_key[(move.start, move.end, move.promotion)] = move
+            self.by_target.setdefault((move.piece.type, move.end), []).append(move)
+
+    def find(self, start: Position, end: Position, promotion: Optional[str] = None) -> Optional[Move]:
+        return self.by_key.get((start, end, promotion))
+
+
+# --------------------------------------------------
+# UCI
+# --------------------------------------------------
+def move_to_uci(move: Move) -> str:
+    return square_name(move.start) + square_name(move.end) + (move.promotion or "")
+
+
+def parse_uci(text: str, state: "GameState", index: Optional[MoveIndex] = None) -> Optional[Move]:
+    """
+    Returns the legal move written as `text` in UCI notation ("e2e4",
+    "e7e8q"), or None.
+    """
+    match = UCI_PATTERN.match(text.strip().lower())
+    if not match:
+        return None
+    index = index or MoveIndex(state)
+    return index.find(parse_square(match.group(1)), parse_square(match.group(2)), match.group(3))
+
+
+# --------------------------------------------------
+# SAN
+# --------------------------------------------------
+def parse_san(text: str, state: "GameState", index: Optional[MoveIndex] = None) -> Optional[Move]:
+    """
+    Returns the legal move written as `text` in standard algebraic
+    notation ("Nf3", "exd5", "e8=Q+", "O-O"), or None.
+    """
+    text = text.strip()
+    index = index or MoveIndex(state)
+
+    castle = text.rstrip("+#!?").replace("0", "O")
+    if castle in ("O-O", "O-O-O"):
+        row = 7 if state.turn == Color.WHITE else 0
+        end_col = 6 if castle == "O-O" else 2
+        return index.find((row, 4), (row, end_col))
+
+    match = SAN_PATTERN.match(text)
+    if not match:
+        return None
+
+    piece_type = LETTER_PIECES[match.group("piece")] if match.group("piece") else PieceType.PAWN
+    end = parse_square(match.group("end"))
+    promotion = match.group("promotion")
+    promotion = promotion.lower() if promotion else None
+    from_file = FILES.index(match.group("file")) if match.group("file") else None
+    from_row = 8 - int(match.group("rank")) if match.group("rank") else None
+
+    candidates = [
+        move
+        for move in index.by_target.get((piece_type, end), [])
+        if move.promotion == promotion
+        and (from_file is None or move.start[1] == from_file)
+        and (from_row is None or move.start[0] == from_row)
+    ]
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def move_to_san(move: Move, state: "GameState", index: Optional[MoveIndex] = None) -> str:
+    """
+    Writes the legal `move` of the position in `state` in standard
+    algebraic notation, including check and mate markers.
+    """
+    if move.is_castling:
+        san = "O-O" if move.end[1] > move.start[1] else "O-O-O"
+    else:
+        index = index or MoveIndex(state)
+        piece_type = move.piece.type
+        capture = move.is_capture() or move.is_en_passant
+
+        if piece_type == PieceType.PAWN:
+            san = FILES[move.start[1]] + "x" if capture else ""
+        else:
+            san = PIECE_LETTERS[piece_type]
+            rivals = [
+                other
+                for other in index.by_target.get((piece_type, move.end), [])
+                if other.start != move.start
+            ]
+            if rivals:
+                if all(other.start[1] != move.start[1] for other in rivals):
+                    san += FILES[move.start[1]]
+                elif all(other.start[0] != move.start[0] for other in rivals):
+                    san += str(8 - move.start[0])
+                else:
+                    san += square_name(move.start)
+            if capture:
+                san += "x"
+
+        san += square_name(move.end)
+        if move.promotion:
+            san += "=" + move.promotion.upper()
+
+    state.make_move(move)
+    if state.is_in_check(state.turn):
+        san += "#" if not state.get_legal_moves() else "+"
+    state.undo_move()
+    return san
+
+
+def parse_move(text: str, state: "GameState", index: Optional[MoveIndex] = None) -> Optional[Move]:
+    """
+    Accepts a move as coordinates ("e2 e4"), UCI ("e2e4") or SAN ("e4").
+    """
+    index = index or MoveIndex(state)
+    compact = "".join(text.split())
+    return parse_uci(compact, state, index) or parse_san(compact, state, index)
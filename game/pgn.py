@@ -0,0 +1,196 @@
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+import re
+
+from game.piece import Color
+from game.state import GameState
+from game.notation import MoveIndex, move_to_san, parse_san
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+# The "seven tag roster", written first and in this order
+STANDARD_TAGS = ["Event", "Site", "Date", "Round", "White", "Black", "Result"]
+
+TAG_PATTERN = re.compile(r'^\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]\s*$')
+MOVE_NUMBER_PATTERN = re.compile(r"^\d+\.+$|^\d+\.+(?=\S)")
+TOKEN_PATTERN = re.compile(r"\{|\}|\(|\)|;|\$\d+|[^\s{}();]+")
+
+LINE_WIDTH = 80
+
+
+class PGNError(ValueError):
+    pass
+
+
+class PGNGame:
+    """
+    One game read from a PGN file: its tags and its mainline moves in SAN.
+    """
+
+    def __init__(self, headers: Dict[str, str], moves: List[str], result: str = "*"):
+        self.headers = headers
+        self.moves = moves
+        self.result = result
+
+    def replay(self) -> GameState:
+        """
+        Plays the moves from the starting position and returns the final
+        position (with the full move history).
+        """
+        state = GameState()
+        for ply, san in enumerate(self.moves):
+            move = parse_san(san, state, MoveIndex(state))
+            if move is None:
+                raise PGNError(f"illegal or ambiguous move {san!r} at ply {ply + 1}")
+            state.make_move(move)
+        return state
+
+    def __repr__(self):
+        return (
+            f"PGNGame({self.headers.get('White', '?')} - {self.headers.get('Black', '?')}, "
+            f"{len(self.moves)} plies, {self.result})"
+        )
+
+
+# --------------------------------------------------
+# Reading
+# --------------------------------------------------
+def read_games(lines: Iterable[str]) -> Iterator[PGNGame]:
+    """
+    Lazily yields the games of a PGN stream (an open file or any
+    iterable of lines). Only the game being read is held in memory, so
+    arbitrarily large files can be processed. Comments, variations and
+    NAGs are skipped; only mainline moves are kept.
+    """
+    headers: Dict[str, str] = {}
+    moves: List[str] = []
+    result: Optional[str] = None
+    in_movetext = False
+
+    # Lexer state carried across lines
+    comment_depth = 0   # inside { ... }
+    variation_depth = 0  # inside ( ... )
+
+    for raw_line in lines:
+        line = raw_line.strip()
+
+        if comment_depth == 0:
+            if line.startswith("%"):
+                continue  # escaped line
+            tag = TAG_PATTERN.match(line) if line.startswith("[") else None
+            if tag:
+                if in_movetext:
+                    # A tag after movetext starts the next game
+                    yield PGNGame(headers, moves, result or headers.get("Result", "*"))
+                    headers, moves, result, in_movetext = {}, [], None, False
+                    variation_depth = 0
+                headers[tag.group(1)] = tag.group(2).replace('\\"', '"').replace("\\\\", "\\")
+                continue
+
+        if not line:
+            continue
+
+        for token in TOKEN_PATTERN.findall(line):
+            if comment_depth:
+                if token == "}":
+                    comment_depth = 0
+                continue
+            if token == "{":
+                comment_depth = 1
+            elif token == ";":
+                break  # rest of line comment
+            elif token == "(":
+                variation_depth += 1
+            elif token == ")":
+                variation_depth = max(0, variation_depth - 1)
+            elif variation_depth or token.startswith("$"):
+                continue
+            elif token in RESULTS:
+                result = token
+                yield PGNGame(headers, moves, result)
+                headers, moves, result, in_movetext = {}, [], None, False
+                variation_depth = 0
+                break
+            else:
+                token = MOVE_NUMBER_PATTERN.sub("", token)
+                if token:
+                    moves.append(token)
+                    in_movetext = True
+
+    if in_movetext or headers:
+        yield PGNGame(headers, moves, result or headers.get("Result", "*"))
+
+
+def read_file(path: str) -> Iterator[PGNGame]:
+    """
+    Lazily yields the games of the PGN file at `path`.
+    """
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        yield from read_games(handle)
+
+
+# --------------------------------------------------
+# Writing
+# --------------------------------------------------
+def game_result(state: GameState) -> str:
+    """
+    PGN result of the position: decided games and draws, "*" otherwise.
+    """
+    if state.checkmate():
+        return "0-1" if state.turn == Color.WHITE else "1-0"
+    if (
+        state.stalemate()
+        or state.is_threefold_repetition()
+        or state.is_fifty_move_draw()
+        or state.is_insufficient_material()
+    ):
+        return "1/2-1/2"
+    return "*"
+
+
+def game_to_pgn(state: GameState, headers: Optional[Dict[str, str]] = None, result: Optional[str] = None) -> str:
+    """
+    Writes the game played in `state` (from the starting position) as PGN.
+    """
+    result = result or game_result(state)
+    tags = {tag: "?" for tag in STANDARD_TAGS}
+    tags.update(headers or {})
+    tags["Result"] = result
+
+    lines = []
+    for tag in STANDARD_TAGS + [t for t in tags if t not in STANDARD_TAGS]:
+        value = tags[tag].replace("\\", "\\\\").replace('"', '\\"')
+        lines.append(f'[{tag} "{value}"]')
+    lines.append("")
+
+    # Replay on a fresh position to write each move in its own context
+    replay = GameState()
+    tokens = []
+    for ply, played in enumerate(state.move_history):
+        index = MoveIndex(replay)
+        move = index.find(played.start, played.end, played.promotion)
+        if move is None:
+            raise PGNError(f"move history does not replay at ply {ply + 1}")
+        if ply % 2 == 0:
+            tokens.append(f"{ply // 2 + 1}.")
+        tokens.append(move_to_san(move, replay, index))
+        replay.make_move(move)
+    tokens.append(result)
+
+    line = ""
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > LINE_WIDTH:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def write_games(games: Iterable[GameState], out: TextIO):
+    """
+    Writes several finished games to `out`, separated by blank lines.
+    """
+    for state in games:
+        out.write(game_to_pgn(state))
+        out.write("\n")
@@ -1,8 +1,14 @@
-from typing import List, Tuple
+from typing import Iterable, List, Optional, Tuple
 from game.piece import Piece, PieceType, Color
 from game.board import Board, Position
 from game.move import Move
 
+ROOK_DIRECTIONS = [(-1,0),(1,0),(0,-1),(0,1)]
+BISHOP_DIRECTIONS = [(-1,-1),(-1,1),(1,-1),(1,1)]
+KNIGHT_OFFSETS = [(-2,-1),(-2,1),(-1,-2),(-1,2),(1,-2),(1,2),(2,-1),(2,1)]
+KING_OFFSETS = [(-1,-1),(-1,0),(-1,1),(0,-1),(0,1),(1,-1),(1,0),(1,1)]
+
+
 class Rules:
     def __init__(self, board: Board):
         self.board = board
@@ -16,38 +22,150 @@ class Rules:
         return other is not None and piece.color != other.color
 
     def square_under_attack(self, pos: Position, by_color: Color) -> bool:
-        for move in self.generate_pseudo_legal_moves(by_color):
-            if move.end == pos:
-                return True
+        """
+        Looks outward from `pos` for a piece of `by_color` that attacks it.
+
+        Scanning from the target square (instead of generating every
+        opponent move) keeps this cheap and avoids recursing back into
+        castling generation.
+        """
+        row, col = pos
+
+        # Pawns (a white pawn attacks upwards, so it sits one row below)
+        pawn_row = row + 1 if by_color == Color.WHITE else row - 1
+        for dc in [-1, 1]:
+            if self.in_bounds((pawn_row, col + dc)):
+                piece = self.board.get_piece((pawn_row, col + dc))
+                if piece and piece.color == by_color and piece.type == PieceType.PAWN:
+                    return True
+
+        # Knights
+        for dr, dc in KNIGHT_OFFSETS:
+            r, c = row + dr, col + dc
+            if self.in_bounds((r,c)):
+                piece = self.board.get_piece((r,c))
+                if piece and piece.color == by_color and piece.type == PieceType.KNIGHT:
+                    return True
+
+        # King
+        for dr, dc in KING_OFFSETS:
+            r, c = row + dr, col + dc
+            if self.in_bounds((r,c)):
+                piece = self.board.get_piece((r,c))
+                if piece and piece.color == by_color and piece.type == PieceType.KING:
+                    return True
+
+        # Sliding pieces
+        for directions, sliders in [
+            (ROOK_DIRECTIONS, (PieceType.ROOK, PieceType.QUEEN)),
+            (BISHOP_DIRECTIONS, (PieceType.BISHOP, PieceType.QUEEN)),
+        ]:
+            for dr, dc in directions:
+                r, c = row + dr, col + dc
+                while self.in_bounds((r,c)):
+                    piece = self.board.get_piece((r,c))
+                    if piece:
+                        if piece.color == by_color and piece.type in sliders:
+                            return True
+                        break
+                    r += dr
+                    c += dc
+
         return False
 
+    def attackers(self, pos: Position, color: Color, ignore: Iterable[Position] = ()) -> List[Position]:
+        """
+        Squares of all `color` pieces attacking `pos`.
+
+        Squares in `ignore` are treated as empty, which uncovers x-ray
+        attackers: a rook behind a rook, a queen behind a bishop, and so on.
+        """
+        ignore = set(ignore)
+        row, col = pos
+        found = []
+
+        def piece_at(r, c):
+            if (r, c) in ignore:
+                return None
+            return self.board.get_piece((r, c))
+
+        # Pawns (a white pawn attacks upwards, so it sits one row below)
+        pawn_row = row + 1 if color == Color.WHITE else row - 1
+        for dc in [-1, 1]:
+            if self.in_bounds((pawn_row, col + dc)):
+                piece = piece_at(pawn_row, col + dc)
+                if piece and piece.color == color and piece.type == PieceType.PAWN:
+                    found.append((pawn_row, col + dc))
+
+        # Knights and king
+        for offsets, piece_type in [(KNIGHT_OFFSETS, PieceType.KNIGHT), (KING_OFFSETS, PieceType.KING)]:
+            for dr, dc in offsets:
+                r, c = row + dr, col + dc
+                if self.in_bounds((r,c)):
+                    piece = piece_at(r, c)
+                    if piece and piece.color == color and piece.type == piece_type:
+                        found.append((r, c))
+
+        # Sliding pieces
+        for directions, sliders in [
+            (ROOK_DIRECTIONS, (PieceType.ROOK, PieceType.QUEEN)),
+            (BISHOP_DIRECTIONS, (PieceType.BISHOP, PieceType.QUEEN)),
+        ]:
+            for dr, dc in directions:
+                r, c = row + dr, col + dc
+                while self.in_bounds((r,c)):
+                    piece = piece_at(r, c)
+                    if piece:
+                        if piece.color == color and piece.type in sliders:
+                            found.append((r, c))
+                        break
+                    r += dr
+                    c += dc
+
+        return found
+
     # ---------------- Move Generation ----------------
-    def generate_pseudo_legal_moves(self, color: Color) -> List[Move]:
+    # `tactical` selects a subset of the moves: True for captures and
+    # promotions only, False for the remaining quiet moves, None for all.
+    # The search uses the subsets to generate moves in stages.
+    def generate_pseudo_legal_moves(self, color: Color, tactical: Optional[bool] = None) -> List[Move]:
         moves = []
         for row in range(8):
             for col in range(8):
                 piece = self.board.get_piece((row, col))
                 if piece and piece.color == color:
-                    moves.extend(self.get_piece_moves(piece, (row, col)))
+                    moves.extend(self.get_piece_moves(piece, (row, col), tactical))
         return moves
 
-    def get_piece_moves(self, piece: Piece, pos: Position) -> List[Move]:
+    def generate_captures(self, color: Color) -> List[Move]:
+        """
+        Pseudo-legal captures (including en passant) and promotions.
+        """
+        return self.generate_pseudo_legal_moves(color, tactical=True)
+
+    def generate_quiet_moves(self, color: Color) -> List[Move]:
+        """
+        Pseudo-legal moves that neither capture nor promote (including castling).
+        """
+        return self.generate_pseudo_legal_moves(color, tactical=False)
+
+    def get_piece_moves(self, piece: Piece, pos: Position, tactical: Optional[bool] = None) -> List[Move]:
         if piece.type == PieceType.PAWN:
-            return self.pawn_moves(piece, pos)
+            return self.pawn_moves(piece, pos, tactical)
         elif piece.type == PieceType.ROOK:
-            return self.straight_line_moves(piece, pos, [(-1,0),(1,0),(0,-1),(0,1)])
+            return self.straight_line_moves(piece, pos, ROOK_DIRECTIONS, tactical)
         elif piece.type == PieceType.BISHOP:
-            return self.straight_line_moves(piece, pos, [(-1,-1),(-1,1),(1,-1),(1,1)])
+            return self.straight_line_moves(piece, pos, BISHOP_DIRECTIONS, tactical)
         elif piece.type == PieceType.QUEEN:
-            return self.straight_line_moves(piece, pos, [(-1,0),(1,0),(0,-1),(0,1),(-1,-1),(-1,1),(1,-1),(1,1)])
+            return self.straight_line_moves(piece, pos, ROOK_DIRECTIONS + BISHOP_DIRECTIONS, tactical)
         elif piece.type == PieceType.KNIGHT:
-            return self.knight_moves(piece, pos)
+            return self.knight_moves(piece, pos, tactical)
         elif piece.type == PieceType.KING:
-            return self.king_moves(piece, pos)
+            return self.king_moves(piece, pos, tactical)
         return []
 
     # ---------------- Pawn Moves ----------------
-    def pawn_moves(self, piece: Piece, pos: Position) -> List[Move]:
+    def pawn_moves(self, piece: Piece, pos: Position, tactical: Optional[bool] = None) -> List[Move]:
         moves = []
         row, col = pos
         direction = -1 if piece.color == Color.WHITE else 1
@@ -57,16 +175,20 @@ class Rules:
         forward1 = (row + direction, col)
         if self.in_bounds(forward1) and self.board.is_empty(forward1):
             if forward1[0] in [0, 7]:
-                for promo in ['q','r','b','n']:
-                    moves.append(Move(pos, forward1, piece, promotion=promo))
-            else:
+                if tactical is not False:
+                    for promo in ['q','r','b','n']:
+                        moves.append(Move(pos, forward1, piece, promotion=promo))
+            elif tactical is not True:
                 moves.append(Move(pos, forward1, piece))
 
             # Forward 2
             forward2 = (row + 2*direction, col)
-            if row == start_row and self.board.is_empty(forward2):
+            if row == start_row and self.board.is_empty(forward2) and tactical is not True:
                 moves.append(Move(pos, forward2, piece))
 
+        if tactical is False:
+            return moves
+
         # Captures
         for dc in [-1,1]:
             capture_pos = (row + direction, col + dc)
@@ -90,7 +212,13 @@ class Rules:
         return moves
 
     # ---------------- Sliding Pieces ----------------
-    def straight_line_moves(self, piece: Piece, pos: Position, directions: List[Tuple[int,int]]) -> List[Move]:
+    def straight_line_moves(
+        self,
+        piece: Piece,
+        pos: Position,
+        directions: List[Tuple[int,int]],
+        tactical: Optional[bool] = None,
+    ) -> List[Move]:
         moves = []
         for dr, dc in directions:
             r, c = pos
@@ -101,38 +229,43 @@ class Rules:
                     break
                 target = self.board.get_piece((r,c))
                 if target is None:
-                    moves.append(Move(pos, (r,c), piece))
+                    if tactical is not True:
+                        moves.append(Move(pos, (r,c), piece))
                 elif self.is_opponent(piece, target):
-                    moves.append(Move(pos, (r,c), piece, target))
+                    if tactical is not False:
+                        moves.append(Move(pos, (r,c), piece, target))
                     break
                 else:
                     break
         return moves
 
     # ---------------- Knight ----------------
-    def knight_moves(self, piece: Piece, pos: Position) -> List[Move]:
+    def knight_moves(self, piece: Piece, pos: Position, tactical: Optional[bool] = None) -> List[Move]:
         moves = []
         row, col = pos
-        for dr, dc in [(-2,-1),(-2,1),(-1,-2),(-1,2),(1,-2),(1,2),(2,-1),(2,1)]:
+        for dr, dc in KNIGHT_OFFSETS:
             r, c = row + dr, col + dc
             if self.in_bounds((r,c)):
                 target = self.board.get_piece((r,c))
-                if target is None or self.is_opponent(piece, target):
+                if self._wanted(piece, target, tactical):
                     moves.append(Move(pos, (r,c), piece, target))
         return moves
 
     # ---------------- King ----------------
-    def king_moves(self, piece: Piece, pos: Position) -> List[Move]:
+    def king_moves(self, piece: Piece, pos: Position, tactical: Optional[bool] = None) -> List[Move]:
         moves = []
         row, col = pos
 
-        for dr, dc in [(-1,-1),(-1,0),(-1,1),(0,-1),(0,1),(1,-1),(1,0),(1,1)]:
+        for dr, dc in KING_OFFSETS:
             r, c = row + dr, col + dc
             if self.in_bounds((r,c)):
                 target = self.board.get_piece((r,c))
-                if target is None or self.is_opponent(piece, target):
+                if self._wanted(piece, target, tactical):
                     moves.append(Move(pos, (r,c), piece, target))
 
+        if tactical is True:
+            return moves
+
         # Castling (with safety)
         opponent = piece.color.opposite()
         if not piece.has_moved and not self.square_under_attack(pos, opponent):
@@ -146,6 +279,12 @@ class Rules:
 
         return moves
 
+    def _wanted(self, piece: Piece, target: Optional[Piece], tactical: Optional[bool]) -> bool:
+        # Step to an empty or enemy-occupied square, filtered by `tactical`
+        if target is None:
+            return tactical is not True
+        return self.is_opponent(piece, target) and tactical is not False
+
     # ---------------- Castling Helpers ----------------
     def can_castle_kingside(self, color: Color) -> bool:
         row = 7 if color == Color.WHITE else 0
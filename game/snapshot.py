@@ -0,0 +1,359 @@
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+import struct
+
+from game.board import Board
+from game.piece import Piece, PieceType, Color
+from game import zobrist
+
+if TYPE_CHECKING:
+    from game.state import GameState
+
+# --------------------------------------------------
+# Piece Codes
+# --------------------------------------------------
+# A square holds 0 when empty, otherwise the piece type (1-6) with bit 3
+# set for black. The tables below are shared flyweights: decoding a
+# square never allocates.
+EMPTY = 0
+BLACK_BIT = 8
+
+TYPE_CODES: Dict[PieceType, int] = {
+    PieceType.PAWN: 1,
+    PieceType.KNIGHT: 2,
+    PieceType.BISHOP: 3,
+    PieceType.ROOK: 4,
+    PieceType.QUEEN: 5,
+    PieceType.KING: 6,
+}
+
+PIECE_CODES: Dict[Tuple[PieceType, Color], int] = {
+    (piece_type, color): code | (BLACK_BIT if color == Color.BLACK else 0)
+    for piece_type, code in TYPE_CODES.items()
+    for color in Color
+}
+
+# code -> (type, color), or None for an empty square
+DECODE: List[Optional[Tuple[PieceType, Color]]] = [None] * 16
+for _key, _code in PIECE_CODES.items():
+    DECODE[_code] = _key
+
+# Castling mask bits
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+
+CASTLING_BITS = {
+    (Color.WHITE, 'K'): WHITE_KINGSIDE,
+    (Color.WHITE, 'Q'): WHITE_QUEENSIDE,
+    (Color.BLACK, 'K'): BLACK_KINGSIDE,
+    (Color.BLACK, 'Q'): BLACK_QUEENSIDE,
+}
+
+NO_SQUARE = 255
+
+# code -> Zobrist keys per square, for the pawn hash on restore
+PAWN_KEYS: List[Optional[List[int]]] = [None] * 16
+for _color in Color:
+    PAWN_KEYS[PIECE_CODES[(PieceType.PAWN, _color)]] = zobrist.PIECE_KEYS[(_color, PieceType.PAWN)]
+
+# has_moved only matters to castling, so every piece other than kings and
+# rooks can be shared between squares and positions. Such pieces are
+# always flagged as moved: make_move sets the flag anyway.
+_SHARED_TYPES = (PieceType.PAWN, PieceType.KNIGHT, PieceType.BISHOP, PieceType.QUEEN)
+
+
+def _shared_piece(piece_type: PieceType, color: Color) -> Piece:
+    piece = Piece(piece_type, color)
+    piece.has_moved = True
+    return piece
+
+
+SHARED_PIECES: List[Optional[Piece]] = [None] * 16
+for (_type, _color), _code in PIECE_CODES.items():
+    if _type in _SHARED_TYPES:
+        SHARED_PIECES[_code] = _shared_piece(_type, _color)
+
+# turn, castling, en passant, halfmove clock, history length, hash
+HEADER = struct.Struct("<BBBHHQ")
+
+FEN_LETTERS = {
+    PieceType.PAWN: 'p',
+    PieceType.KNIGHT: 'n',
+    PieceType.BISHOP: 'b',
+    PieceType.ROOK: 'r',
+    PieceType.QUEEN: 'q',
+    PieceType.KING: 'k',
+}
+FEN_CASTLING = [(WHITE_KINGSIDE, 'K'), (WHITE_QUEENSIDE, 'Q'), (BLACK_KINGSIDE, 'k'), (BLACK_QUEENSIDE, 'q')]
+
+# code -> FEN letter (uppercase for white)
+FEN_CODES: Dict[str, int] = {}
+for (_type, _color), _code in PIECE_CODES.items():
+    _letter = FEN_LETTERS[_type]
+    FEN_CODES[_letter.upper() if _color == Color.WHITE else _letter] = _code
+CODE_LETTERS = {code: letter for letter, code in FEN_CODES.items()}
+
+
+class Snapshot:
+    """
+    Compact, self-contained copy of a position.
+
+    The board is a 64-byte bytearray of piece codes (index row * 8 + col)
+    followed by the side to move, castling mask, en passant square,
+    halfmove clock and Zobrist hash. `history` keeps the hashes of the
+    positions since the last irreversible move, so repetition detection
+    survives the round trip.
+
+    Converting from and to a GameState is O(64), and to_bytes() is a
+    flat byte string that is cheap to copy, hash or send to another
+    process.
+    """
+
+    __slots__ = ("board", "turn", "castling", "en_passant", "halfmove_clock", "zobrist_hash", "history")
+
+    def __init__(
+        self,
+        board: bytearray,
+        turn: Color,
+        castling: int,
+        en_passant: int,
+        halfmove_clock: int,
+        zobrist_hash: int,
+        history: Sequence[int] = (),
+    ):
+        self.board = board
+        self.turn = turn
+        self.castling = castling
+        self.en_passant = en_passant
+        self.halfmove_clock = halfmove_clock
+        self.zobrist_hash = zobrist_hash
+        self.history = tuple(history)
+
+    # ---------------- GameState -> Snapshot ----------------
+    @classmethod
+    def from_state(cls, state: "GameState") -> "Snapshot":
+        board = bytearray(64)
+        for row in range(8):
+            grid_row = state.board.grid[row]
+            for col in range(8):
+                piece = grid_row[col]
+                if piece:
+                    board[row * 8 + col] = PIECE_CODES[(piece.type, piece.color)]
+
+        castling = 0
+        for color, rights in state.castling_rights.items():
+            for side, allowed in rights.items():
+                if allowed:
+                    castling |= CASTLING_BITS[(color, side)]
+
+        target = state.en_passant_target
+        en_passant = NO_SQUARE if target is None else target[0] * 8 + target[1]
+
+        # Only positions since the last irreversible move can repeat
+        reversible = min(state.halfmove_clock, len(state.hash_history))
+        history = state.hash_history[len(state.hash_history) - reversible:]
+
+        return cls(
+            board, state.turn, castling, en_passant,
+            state.halfmove_clock, state.zobrist_hash, history,
+        )
+
+    # ---------------- Snapshot -> GameState ----------------
+    def to_state(self) -> "GameState":
+        """
+        Builds a GameState for this position (without move history).
+
+        Pawns, knights, bishops and queens are the shared SHARED_PIECES
+        instances; only kings and rooks, whose has_moved flag decides
+        castling, are allocated. They are unmoved exactly when a castling
+        right still needs them.
+
+        The Zobrist hash is taken from the snapshot rather than recomputed.
+        """
+        from game.state import GameState
+
+        board = Board(setup=False)
+        grid = board.grid
+        unmoved = self._unmoved_squares()
+        pawn_hash = 0
+
+        for square, code in enumerate(self.board):
+            if code == EMPTY:
+                continue
+            pawn_keys = PAWN_KEYS[code]
+            if pawn_keys is not None:
+                pawn_hash ^= pawn_keys[square]
+            piece = SHARED_PIECES[code]
+            if piece is None:
+                piece_type, color = DECODE[code]
+                piece = Piece(piece_type, color)
+                piece.has_moved = square not in unmoved
+            grid[square // 8][square % 8] = piece
+
+            if piece.type == PieceType.KING:
+                if piece.color == Color.WHITE:
+                    board.white_king_pos = (square // 8, square % 8)
+                else:
+                    board.black_king_pos = (square // 8, square % 8)
+
+        board.en_passant_target = (
+            None if self.en_passant == NO_SQUARE else (self.en_passant // 8, self.en_passant % 8)
+        )
+        castling_rights = {
+            color: {side: bool(self.castling & CASTLING_BITS[(color, side)]) for side in ('K', 'Q')}
+            for color in (Color.WHITE, Color.BLACK)
+        }
+        return GameState.from_position(
+            board, self.turn, castling_rights, self.halfmove_clock,
+            zobrist_hash=self.zobrist_hash, pawn_hash=pawn_hash, hash_history=list(self.history),
+        )
+
+    def _unmoved_squares(self) -> set:
+        unmoved = set()
+        for color, row in ((Color.WHITE, 7), (Color.BLACK, 0)):
+            kingside = self.castling & CASTLING_BITS[(color, 'K')]
+            queenside = self.castling & CASTLING_BITS[(color, 'Q')]
+            if kingside or queenside:
+                unmoved.add(row * 8 + 4)
+            if kingside:
+                unmoved.add(row * 8 + 7)
+            if queenside:
+                unmoved.add(row * 8)
+        return unmoved
+
+    # ---------------- FEN ----------------
+    @classmethod
+    def from_fen(cls, fen: str) -> "Snapshot":
+        """
+        Reads a position in Forsyth-Edwards Notation. The fullmove number
+        is ignored; the halfmove clock defaults to 0 when omitted.
+        """
+        fields = fen.split()
+        if len(fields) < 4:
+            raise ValueError(f"invalid FEN: {fen!r}")
+        placement, side, castling_field, en_passant_field = fields[:4]
+
+        board = bytearray(64)
+        ranks = placement.split("/")
+        if len(ranks) != 8:
+            raise ValueError(f"invalid FEN placement: {placement!r}")
+        for row, rank in enumerate(ranks):
+            col = 0
+            for char in rank:
+                if char.isdigit():
+                    col += int(char)
+                elif char in FEN_CODES and col < 8:
+                    board[row * 8 + col] = FEN_CODES[char]
+                    col += 1
+                else:
+                    raise ValueError(f"invalid FEN placement: {placement!r}")
+            if col != 8:
+                raise ValueError(f"invalid FEN placement: {placement!r}")
+
+        if side not in ("w", "b"):
+            raise ValueError(f"invalid FEN side to move: {side!r}")
+        turn = Color.WHITE if side == "w" else Color.BLACK
+
+        castling = 0
+        if castling_field != "-":
+            for bit, letter in FEN_CASTLING:
+                if letter in castling_field:
+                    castling |= bit
+
+        if en_passant_field == "-":
+            en_passant = NO_SQUARE
+        else:
+            en_passant = (8 - int(en_passant_field[1])) * 8 + "abcdefgh".index(en_passant_field[0])
+
+        halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+
+        snapshot = cls(board, turn, castling, en_passant, halfmove_clock, 0)
+        snapshot.zobrist_hash = snapshot.compute_hash()
+        return snapshot
+
+    def to_fen(self, fullmove_number: int = 1) -> str:
+        ranks = []
+        for row in range(8):
+            rank, empty = "", 0
+            for code in self.board[row * 8:row * 8 + 8]:
+                if code == EMPTY:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                rank += CODE_LETTERS[code]
+            ranks.append(rank + (str(empty) if empty else ""))
+
+        castling = "".join(letter for bit, letter in FEN_CASTLING if self.castling & bit) or "-"
+        if self.en_passant == NO_SQUARE:
+            en_passant = "-"
+        else:
+            en_passant = "abcdefgh"[self.en_passant % 8] + str(8 - self.en_passant // 8)
+
+        side = "w" if self.turn == Color.WHITE else "b"
+        return f"{'/'.join(ranks)} {side} {castling} {en_passant} {self.halfmove_clock} {fullmove_number}"
+
+    # ---------------- Hashing ----------------
+    def compute_hash(self) -> int:
+        """
+        Zobrist hash of the position, matching zobrist.compute_hash.
+        """
+        key = 0
+        for square, code in enumerate(self.board):
+            if code != EMPTY:
+                piece_type, color = DECODE[code]
+                key ^= zobrist.PIECE_KEYS[(color, piece_type)][square]
+
+        if self.turn == Color.BLACK:
+            key ^= zobrist.SIDE_KEY
+        for (color, side), bit in CASTLING_BITS.items():
+            if self.castling & bit:
+                key ^= zobrist.CASTLING_KEYS[(color, side)]
+        if self.en_passant != NO_SQUARE:
+            key ^= zobrist.EN_PASSANT_KEYS[self.en_passant % 8]
+        return key
+
+    # ---------------- Queries ----------------
+    def piece_at(self, square: int) -> Optional[Tuple[PieceType, Color]]:
+        return DECODE[self.board[square]]
+
+    def copy(self) -> "Snapshot":
+        return Snapshot(
+            bytearray(self.board), self.turn, self.castling, self.en_passant,
+            self.halfmove_clock, self.zobrist_hash, self.history,
+        )
+
+    # ---------------- Serialization ----------------
+    def to_bytes(self) -> bytes:
+        header = HEADER.pack(
+            0 if self.turn == Color.WHITE else 1,
+            self.castling,
+            self.en_passant,
+            self.halfmove_clock,
+            len(self.history),
+            self.zobrist_hash,
+        )
+        return bytes(self.board) + header + struct.pack(f"<{len(self.history)}Q", *self.history)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Snapshot":
+        turn, castling, en_passant, halfmove_clock, history_length, zobrist_hash = (
+            HEADER.unpack_from(data, 64)
+        )
+        history = struct.unpack_from(f"<{history_length}Q", data, 64 + HEADER.size)
+        return cls(
+            bytearray(data[:64]),
+            Color.WHITE if turn == 0 else Color.BLACK,
+            castling, en_passant, halfmove_clock, zobrist_hash, history,
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, Snapshot) and self.to_bytes() == other.to_bytes()
+
+    def __hash__(self):
+        return self.zobrist_hash
+
+    def __repr__(self):
+        return f"Snapshot({self.turn.name}, hash={self.zobrist_hash:016x})"
@@ -1,28 +1,97 @@
 from typing import List, Optional, Tuple
-import copy
 
 from game.board import Board, Position
 from game.piece import Piece, Color, PieceType
 from game.move import Move
 from game.rules import Rules
 from game.checkmate import is_checkmate, is_stalemate  # integrate our module
+from game import zobrist
+
+# Halfmove clock value (plies without a capture or pawn move) that draws the game
+FIFTY_MOVE_PLIES = 100
 
 
 class GameState:
     def __init__(self):
-        self.board = Board()
+        self._init_position(
+            Board(),
+            Color.WHITE,
+            {
+                Color.WHITE: {'K': True, 'Q': True},
+                Color.BLACK: {'K': True, 'Q': True}
+            },
+        )
+
+    @classmethod
+    def from_position(
+        cls,
+        board: Board,
+        turn: Color,
+        castling_rights: dict,
+        halfmove_clock: int = 0,
+        zobrist_hash: Optional[int] = None,
+        pawn_hash: Optional[int] = None,
+        hash_history: Optional[List[int]] = None,
+    ) -> "GameState":
+        """
+        Builds a state for an arbitrary position (en passant target taken
+        from the board) without setting up the starting position first.
+        Hashes the caller already knows are used as given.
+        """
+        state = cls.__new__(cls)
+        state._init_position(board, turn, castling_rights, halfmove_clock, zobrist_hash, pawn_hash, hash_history)
+        return state
+
+    def _init_position(
+        self,
+        board: Board,
+        turn: Color,
+        castling_rights: dict,
+        halfmove_clock: int = 0,
+        zobrist_hash: Optional[int] = None,
+        pawn_hash: Optional[int] = None,
+        hash_history: Optional[List[int]] = None,
+    ):
+        self.board = board
         self.rules = Rules(self.board)
-        self.turn = Color.WHITE
+        self.turn = turn
         self.move_history: List[Move] = []
 
         # Track castling rights
-        self.castling_rights = {
-            Color.WHITE: {'K': True, 'Q': True},
-            Color.BLACK: {'K': True, 'Q': True}
-        }
+        self.castling_rights = castling_rights
+
+        # Plies since the last capture or pawn move (fifty-move rule)
+        self.halfmove_clock = halfmove_clock
 
-        # Track en passant target square
-        self.en_passant_target: Optional[Position] = None
+        # Zobrist hash of the current position, plus the hashes of every
+        # earlier position in the game (oldest first) for repetition checks
+        if zobrist_hash is None:
+            zobrist_hash = zobrist.compute_hash(
+                self.board, self.turn, self.castling_rights, self.en_passant_target
+            )
+        self.zobrist_hash = zobrist_hash
+        self.hash_history: List[int] = hash_history if hash_history is not None else []
+
+        # Hash of the pawns alone (pawn structure cache key)
+        self.pawn_hash = pawn_hash if pawn_hash is not None else zobrist.compute_pawn_hash(self.board)
+
+        # (en passant target, halfmove clock, moves made before it) saved
+        # by each null move
+        self._null_move_stack: List[Tuple[Optional[Position], int, int]] = []
+
+        # Optional NNUE accumulator (ai.nnue.Accumulator), kept in step by
+        # make_move and undo_move while set
+        self.accumulator = None
+
+    # ---------------- En Passant ----------------
+    @property
+    def en_passant_target(self) -> Optional[Position]:
+        # Stored on the board because Rules reads it from there
+        return self.board.en_passant_target
+
+    @en_passant_target.setter
+    def en_passant_target(self, target: Optional[Position]):
+        self.board.en_passant_target = target
 
     # ---------------- Utilities ----------------
     def opponent(self, color: Color) -> Color:
@@ -42,20 +111,47 @@ class GameState:
         """
         Generates all moves that do not leave the king in check.
         """
-        legal_moves = []
-        for move in self.rules.generate_pseudo_legal_moves(self.turn):
-            self.make_move(move)
-            if not self.is_in_check(self.turn):
-                legal_moves.append(move)
-            self.undo_move()
-        return legal_moves
+        return [
+            move
+            for move in self.rules.generate_pseudo_legal_moves(self.turn)
+            if self.is_legal(move)
+        ]
+
+    def is_legal(self, move: Move) -> bool:
+        """
+        Returns True if the pseudo-legal `move` does not leave the mover's
+        king in check.
+        """
+        self.make_move(move)
+        legal = not self.leaves_king_in_check()
+        self.undo_move()
+        return legal
+
+    def leaves_king_in_check(self) -> bool:
+        """
+        Returns True if the move just made left its own king in check.
+
+        Lets the search make a pseudo-legal move once and reject it
+        afterwards, instead of testing legality up front.
+        """
+        # make_move has flipped the turn: the mover is now the opponent
+        return self.is_in_check(self.opponent(self.turn))
 
     # ---------------- Make Move ----------------
     def make_move(self, move: Move):
         # Save state for undo
         move.previous_en_passant = self.en_passant_target
-        move.previous_castling_rights = copy.deepcopy(self.castling_rights)
+        move.previous_castling_rights = {
+            color: dict(rights) for color, rights in self.castling_rights.items()
+        }
         move.previous_has_moved = move.piece.has_moved
+        move.previous_halfmove_clock = self.halfmove_clock
+        move.previous_pawn_hash = self.pawn_hash
+
+        self.hash_history.append(self.zobrist_hash)
+        key = self.zobrist_hash
+        key ^= zobrist.castling_key(self.castling_rights)
+        key ^= zobrist.en_passant_key(self.en_passant_target)
 
         self.en_passant_target = None
 
@@ -64,8 +160,22 @@ class GameState:
             captured_pos = (move.start[0], move.end[1])
             move.captured = self.board.get_piece(captured_pos)
             self.board.set_piece(captured_pos, None)
+            captured_key = zobrist.piece_key(move.captured.color, move.captured.type, captured_pos)
+            key ^= captured_key
+            self.pawn_hash ^= captured_key
+        else:
+            target = self.board.get_piece(move.end)
+            if target:
+                captured_key = zobrist.piece_key(target.color, target.type, move.end)
+                key ^= captured_key
+                if target.type == PieceType.PAWN:
+                    self.pawn_hash ^= captured_key
 
         # --- Move Piece ---
+        start_key = zobrist.piece_key(move.piece.color, move.piece.type, move.start)
+        key ^= start_key
+        if move.piece.type == PieceType.PAWN:
+            self.pawn_hash ^= start_key
         self.board.move_piece(move.start, move.end)
         move.piece.has_moved = True
 
@@ -80,6 +190,8 @@ class GameState:
             rook = self.board.get_piece(rook_start)
             self.board.move_piece(rook_start, rook_end)
             rook.has_moved = True
+            key ^= zobrist.piece_key(rook.color, rook.type, rook_start)
+            key ^= zobrist.piece_key(rook.color, rook.type, rook_end)
 
         # --- Promotion ---
         if move.promotion:
@@ -94,6 +206,12 @@ class GameState:
             )
             promoted_piece.has_moved = True
             self.board.set_piece(move.end, promoted_piece)
+            key ^= zobrist.piece_key(promoted_piece.color, promoted_piece.type, move.end)
+        else:
+            end_key = zobrist.piece_key(move.piece.color, move.piece.type, move.end)
+            key ^= end_key
+            if move.piece.type == PieceType.PAWN:
+                self.pawn_hash ^= end_key
 
         # --- En Passant Target ---
         if move.piece.type == PieceType.PAWN and abs(move.start[0] - move.end[0]) == 2:
@@ -112,6 +230,28 @@ class GameState:
             elif move.start[1] == 7:
                 self.castling_rights[move.piece.color]['K'] = False
 
+        # A rook captured on its home square takes its castling right with it
+        if move.captured and move.captured.type == PieceType.ROOK:
+            home_row = 7 if move.captured.color == Color.WHITE else 0
+            if move.end == (home_row, 0):
+                self.castling_rights[move.captured.color]['Q'] = False
+            elif move.end == (home_row, 7):
+                self.castling_rights[move.captured.color]['K'] = False
+
+        # --- Halfmove Clock ---
+        if move.piece.type == PieceType.PAWN or move.captured:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+
+        key ^= zobrist.castling_key(self.castling_rights)
+        key ^= zobrist.en_passant_key(self.en_passant_target)
+        key ^= zobrist.SIDE_KEY
+        self.zobrist_hash = key
+
+        if self.accumulator is not None:
+            self.accumulator.apply_move(move, self.board)
+
         self.move_history.append(move)
         self.turn = self.opponent(self.turn)
 
@@ -123,9 +263,14 @@ class GameState:
         move = self.move_history.pop()
         self.turn = self.opponent(self.turn)
 
-        # Restore castling and en passant
+        # Restore castling, en passant, clock and hash
         self.castling_rights = move.previous_castling_rights
         self.en_passant_target = move.previous_en_passant
+        self.halfmove_clock = move.previous_halfmove_clock
+        self.zobrist_hash = self.hash_history.pop()
+        self.pawn_hash = move.previous_pawn_hash
+        if self.accumulator is not None:
+            self.accumulator.pop()
 
         # --- Undo Promotion ---
         if move.promotion:
@@ -145,7 +290,8 @@ class GameState:
 
         # --- Restore Piece Positions ---
         self.board.set_piece(move.start, move.piece)
-        self.board.set_piece(move.end, move.captured)
+        # An en passant capture's victim is restored on its own square below
+        self.board.set_piece(move.end, None if move.is_en_passant else move.captured)
         move.piece.has_moved = move.previous_has_moved
 
         # --- Restore En Passant Pawn ---
@@ -160,9 +306,123 @@ class GameState:
             else:
                 self.board.black_king_pos = move.start
 
+    # ---------------- Null Move ----------------
+    def make_null_move(self):
+        """
+        Passes the turn without moving a piece (used by null-move pruning).
+
+        The halfmove clock is reset so repetition checks never look back
+        across a null move.
+        """
+        self._null_move_stack.append(
+            (self.en_passant_target, self.halfmove_clock, len(self.move_history))
+        )
+        self.hash_history.append(self.zobrist_hash)
+
+        self.zobrist_hash ^= zobrist.en_passant_key(self.en_passant_target)
+        self.zobrist_hash ^= zobrist.SIDE_KEY
+        self.en_passant_target = None
+        self.halfmove_clock = 0
+        self.turn = self.opponent(self.turn)
+
+    def undo_null_move(self):
+        if not self._null_move_stack:
+            return
+
+        self.en_passant_target, self.halfmove_clock, _ = self._null_move_stack.pop()
+        self.zobrist_hash = self.hash_history.pop()
+        self.turn = self.opponent(self.turn)
+
+    @property
+    def null_move_count(self) -> int:
+        return len(self._null_move_stack)
+
+    def unwind(self, move_count: int, null_move_count: int):
+        """
+        Takes back moves and null moves, most recent first, until only
+        `move_count` moves and `null_move_count` null moves remain.
+        Restores the position after a search is aborted midway.
+        """
+        while len(self.move_history) > move_count or len(self._null_move_stack) > null_move_count:
+            null_on_top = (
+                len(self._null_move_stack) > null_move_count
+                and self._null_move_stack[-1][2] == len(self.move_history)
+            )
+            if null_on_top:
+                self.undo_null_move()
+            else:
+                self.undo_move()
+
+    # ---------------- Draw Detection ----------------
+    def is_repetition(self, count: int = 2) -> bool:
+        """
+        Returns True if the current position has occurred `count` times.
+
+        Only positions with the same side to move are compared, and the
+        scan stops at the last capture or pawn move since no earlier
+        position can repeat across an irreversible move.
+        """
+        seen = 1
+        limit = min(self.halfmove_clock, len(self.hash_history))
+        for i in range(2, limit + 1, 2):
+            if self.hash_history[-i] == self.zobrist_hash:
+                seen += 1
+                if seen >= count:
+                    return True
+        return False
+
+    def is_threefold_repetition(self) -> bool:
+        return self.is_repetition(3)
+
+    def is_fifty_move_draw(self) -> bool:
+        return self.halfmove_clock >= FIFTY_MOVE_PLIES
+
+    def is_insufficient_material(self) -> bool:
+        """
+        Returns True for the dead draws K vs K, K+B vs K and K+N vs K.
+
+        Stops at the first pawn, rook or queen (or second minor piece),
+        so most positions are decided within a row or two.
+        """
+        minor_seen = False
+        for row in self.board.grid:
+            for piece in row:
+                if piece is None or piece.type == PieceType.KING:
+                    continue
+                if piece.type in (PieceType.KNIGHT, PieceType.BISHOP) and not minor_seen:
+                    minor_seen = True
+                    continue
+                return False
+        return True
+
     # ---------------- Checkmate / Stalemate ----------------
     def checkmate(self) -> bool:
         return is_checkmate(self, self.turn)
 
     def stalemate(self) -> bool:
         return is_stalemate(self, self.turn)
+
+    # Aliases used by the game loop and the search
+    is_checkmate = checkmate
+    is_stalemate = stalemate
+
+    def get_game_status(self) -> str:
+        if self.checkmate():
+            return f"Checkmate! {self.opponent(self.turn).name} wins"
+
+        if self.stalemate():
+            return "Stalemate"
+
+        if self.is_threefold_repetition():
+            return "Draw by threefold repetition"
+
+        if self.is_fifty_move_draw():
+            return "Draw by fifty-move rule"
+
+        if self.is_insufficient_material():
+            return "Draw by insufficient material"
+
+        if self.is_in_check(self.turn):
+            return "Check"
+
+        return "Ongoing"
@@ -0,0 +1,98 @@
+import random
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from game.piece import Color, PieceType
+
+if TYPE_CHECKING:
+    from game.board import Board, Position
+
+
+# Fixed seed so hashes are reproducible between runs (and processes)
+_rng = random.Random(0x5EED_C4E55)
+
+
+def _rand64() -> int:
+    return _rng.getrandbits(64)
+
+
+PIECE_KEYS: Dict[Tuple[Color, PieceType], List[int]] = {
+    (color, piece_type): [_rand64() for _ in range(64)]
+    for color in Color
+    for piece_type in PieceType
+}
+
+SIDE_KEY: int = _rand64()
+
+CASTLING_KEYS: Dict[Tuple[Color, str], int] = {
+    (color, side): _rand64()
+    for color in Color
+    for side in ('K', 'Q')
+}
+
+EN_PASSANT_KEYS: List[int] = [_rand64() for _ in range(8)]
+
+
+# --------------------------------------------------
+# Key Helpers
+# --------------------------------------------------
+def piece_key(color: Color, piece_type: PieceType, pos: "Position") -> int:
+    row, col = pos
+    return PIECE_KEYS[(color, piece_type)][row * 8 + col]
+
+
+def castling_key(castling_rights: Dict[Color, Dict[str, bool]]) -> int:
+    key = 0
+    for color, rights in castling_rights.items():
+        for side, allowed in rights.items():
+            if allowed:
+                key ^= CASTLING_KEYS[(color, side)]
+    return key
+
+
+def en_passant_key(target: Optional["Position"]) -> int:
+    if target is None:
+        return 0
+    return EN_PASSANT_KEYS[target[1]]
+
+
+# --------------------------------------------------
+# Full Hash
+# --------------------------------------------------
+def compute_hash(
+    board: "Board",
+    turn: Color,
+    castling_rights: Dict[Color, Dict[str, bool]],
+    en_passant_target: Optional["Position"],
+) -> int:
+    """
+    Computes the Zobrist hash of a position from scratch.
+
+    GameState keeps its hash up to date incrementally; this is used to
+    seed it and to verify the incremental updates.
+    """
+    key = 0
+    for row in range(8):
+        for col in range(8):
+            piece = board.grid[row][col]
+            if piece:
+                key ^= PIECE_KEYS[(piece.color, piece.type)][row * 8 + col]
+
+    if turn == Color.BLACK:
+        key ^= SIDE_KEY
+
+    key ^= castling_key(castling_rights)
+    key ^= en_passant_key(en_passant_target)
+    return key
+
+
+def compute_pawn_hash(board: "Board") -> int:
+    """
+    Zobrist hash over the pawns only, used to cache pawn-structure terms.
+    """
+    key = 0
+    for row in range(8):
+        for col in range(8):
+            piece = board.grid[row][col]
+            if piece and piece.type == PieceType.PAWN:
+                key ^= PIECE_KEYS[(piece.color, piece.type)][row * 8 + col]
+    return key
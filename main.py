@@ -1,8 +1,15 @@
+import time
+
 from game.state import GameState
 from game.piece import Color
 from game.move import Move
+from game import notation
 from ai.engine import ChessAI
 
+# AI game clock: starting time and increment per move, in seconds
+AI_CLOCK_SECONDS = 300.0
+AI_INCREMENT_SECONDS = 2.0
+
 
 # ------------------------------
 # Utilities
@@ -44,20 +51,9 @@ def piece_symbol(piece):
 
 def parse_move(user_input: str, state: GameState) -> Move:
     """
-    Converts 'e2 e4' input into a Move object.
+    Converts 'e2 e4', 'e2e4' or SAN ('e4', 'Nf3') input into a Move object.
     """
-    try:
-        start_str, end_str = user_input.strip().split()
-        start = (8 - int(start_str[1]), ord(start_str[0].lower()) - ord("a"))
-        end = (8 - int(end_str[1]), ord(end_str[0].lower()) - ord("a"))
-    except Exception:
-        return None
-
-    for move in state.get_legal_moves():
-        if move.start == start and move.end == end:
-            return move
-
-    return None
+    return notation.parse_move(user_input, state)
 
 
 # ------------------------------
@@ -70,6 +66,7 @@ def main():
     human_color = Color.WHITE
     ai_color = Color.BLACK
     ai_player = ChessAI(color=ai_color, depth=3)
+    ai_clock = AI_CLOCK_SECONDS
 
     print("Welcome to Chess AI!")
     print_board(state)
@@ -77,7 +74,7 @@ def main():
     while True:
         # ---------------- Human Turn ----------------
         if state.turn == human_color:
-            print("Your move (e.g., e2 e4): ")
+            print("Your move (e.g., e2 e4 or Nf3): ")
             user_input = input("> ")
             move = parse_move(user_input, state)
             if move:
@@ -89,10 +86,15 @@ def main():
         # ---------------- AI Turn ----------------
         else:
             print("AI is thinking...")
-            move = ai_player.choose_move(state)
+            started = time.monotonic()
+            move = ai_player.choose_move(
+                state, remaining=ai_clock, increment=AI_INCREMENT_SECONDS
+            )
+            ai_clock += AI_INCREMENT_SECONDS - (time.monotonic() - started)
             if move:
+                san = notation.move_to_san(move, state)
                 state.make_move(move)
-                print(f"AI moves {move.start} -> {move.end}")
+                print(f"AI moves {san}")
             else:
                 # No legal moves
                 print("AI has no moves left.")
@@ -113,6 +115,14 @@ def main():
             print("Stalemate! Draw.")
             break
 
+        if (
+            state.is_threefold_repetition()
+            or state.is_fifty_move_draw()
+            or state.is_insufficient_material()
+        ):
+            print(f"{state.get_game_status()}!")
+            break
+
         if state.is_in_check(state.turn):
             print(f"{state.turn.name} is in check!")
 
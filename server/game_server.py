@@ -0,0 +1,367 @@
+"""
+asyncio game server: many games at once, searches in worker processes.
+
+Protocol: one JSON object per line in each direction, over TCP or a
+Unix socket. Every request has a "cmd"; an optional "id" is echoed in
+the response so a client can run several games on one connection.
+
+    {"cmd": "new_game", "ai_color": "black", "depth": 3, "move_time": 2.0}
+    {"cmd": "move", "game_id": "...", "move": "e2e4"}   # UCI or SAN
+    {"cmd": "go", "game_id": "..."}                     # engine moves
+    {"cmd": "state", "game_id": "..."}
+    {"cmd": "close", "game_id": "..."}
+
+After a "move" the engine answers at once if it is its turn. Responses
+carry "ok" and either the game ("game_id", "moves", "turn", "status",
+plus "ai_move" after an engine move) or an "error".
+
+"depth" caps the engine's search depth (at most MAX_DEPTH) and
+"move_time" its time per move; the search stops at whichever comes
+first. If the worker doesn't answer in time the response is an error
+that still carries the game, since the client's move has been played.
+
+Games belong to the connection that created them and are dropped when
+it disconnects. A search in progress is then stopped: queued jobs are
+cancelled, and a running worker is told to stop through a shared flag
+and aborts at its next time check. Its pool slot stays taken until it
+has actually finished.
+
+    python -m server.game_server --port 8765 --workers 4
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+
+from game.piece import Color
+from game.state import GameState
+from game.notation import MoveIndex, move_to_uci, parse_move
+from game.pgn import game_result
+from game.snapshot import Snapshot
+
+MAX_LINE_BYTES = 64 * 1024
+DEFAULT_MOVE_TIME = 2.0
+MAX_MOVE_TIME = 30.0
+MAX_DEPTH = 8
+# Extra time allowed for a worker to answer beyond its move time
+WORKER_GRACE = 2.0
+
+COLORS = {"white": Color.WHITE, "black": Color.BLACK}
+
+
+class ProtocolError(Exception):
+    def __init__(self, message: str, game: Optional[dict] = None):
+        super().__init__(message)
+        # Game fields sent back with the error, when it has changed
+        self.game = game or {}
+
+
+# --------------------------------------------------
+# Worker Process
+# --------------------------------------------------
+# Stop flags shared with the server, one per search slot (set in each
+# pool process by init_worker)
+_stop_flags = None
+
+
+def init_worker(stop_flags):
+    global _stop_flags
+    _stop_flags = stop_flags
+
+
+def search_worker(snapshot: bytes, depth: int, move_time: float, slot: Optional[int] = None) -> Optional[str]:
+    """
+    Runs in a pool process: restores the position from its snapshot and
+    returns the engine's move in UCI, or None if there is no legal move.
+    The search is cut short when the server raises the flag of `slot`.
+    """
+    # Imported here so the server process doesn't load the engine
+    from ai.engine import ChessAI
+
+    state = Snapshot.from_bytes(snapshot).to_state()
+
+    ai = ChessAI(state.turn, depth=depth)
+    if slot is not None and _stop_flags is not None:
+        ai.time_manager.stop = lambda: bool(_stop_flags[slot])
+    move = ai.choose_move(state, move_time=move_time)
+    return move_to_uci(move) if move else None
+
+
+# --------------------------------------------------
+# Sessions
+# --------------------------------------------------
+class Session:
+    """
+    One game hosted by the server. Kept small: hundreds of idle sessions
+    cost little more than their positions.
+    """
+
+    __slots__ = ("game_id", "state", "moves", "ai_color", "depth", "move_time", "lock", "search")
+
+    def __init__(self, game_id: str, ai_color: Optional[Color], depth: int, move_time: float):
+        self.game_id = game_id
+        self.state = GameState()
+        self.moves: List[str] = []  # UCI
+        self.ai_color = ai_color
+        self.depth = depth
+        self.move_time = move_time
+        self.lock = asyncio.Lock()
+        self.search: Optional[asyncio.Future] = None
+
+    def play(self, text: str) -> str:
+        move = parse_move(text, self.state, MoveIndex(self.state))
+        if move is None:
+            raise ProtocolError(f"illegal move: {text}")
+        uci = move_to_uci(move)
+        self.state.make_move(move)
+        self.moves.append(uci)
+        return uci
+
+    def status(self) -> str:
+        return self.state.get_game_status()
+
+    def is_over(self) -> bool:
+        return game_result(self.state) != "*"
+
+    def describe(self) -> dict:
+        return {
+            "game_id": self.game_id,
+            "moves": self.moves,
+            "turn": self.state.turn.name.lower(),
+            "status": self.status(),
+        }
+
+
+# --------------------------------------------------
+# Server
+# --------------------------------------------------
+class GameServer:
+    def __init__(self, workers: int = 2, max_pending: Optional[int] = None):
+        slots = max_pending or workers * 2
+        # Workers are spawned rather than forked: a forked worker would
+        # inherit the open client sockets and keep them alive after the
+        # server closes them
+        context = multiprocessing.get_context("spawn")
+        # One stop flag per search slot, shared with the pool processes
+        self.stop_flags = context.Array("b", slots, lock=False)
+        self.free_slots = list(range(slots))
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=context,
+            initializer=init_worker, initargs=(self.stop_flags,),
+        )
+        # Bounds the searches queued for the pool, so a burst of requests
+        # waits here instead of piling up inside the executor
+        self.pending = asyncio.Semaphore(slots)
+        self.sessions: Dict[str, Session] = {}
+        self._ids = itertools.count(1)
+
+    # ---------------- Lifecycle ----------------
+    async def serve_tcp(self, host: str, port: int):
+        server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE_BYTES)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_unix(self, path: str):
+        server = await asyncio.start_unix_server(self.handle_client, path, limit=MAX_LINE_BYTES)
+        async with server:
+            await server.serve_forever()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # ---------------- Connections ----------------
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        owned: Set[str] = set()
+        tasks: Set[asyncio.Task] = set()
+        write_lock = asyncio.Lock()
+
+        async def respond(message: dict):
+            async with write_lock:
+                writer.write((json.dumps(message) + "\n").encode())
+                await writer.drain()
+
+        async def run(request: dict):
+            try:
+                response = await self.dispatch(request, owned)
+            except ProtocolError as error:
+                response = {"ok": False, "error": str(error), **error.game}
+            if "id" in request:
+                response["id"] = request["id"]
+            await respond(response)
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await respond({"ok": False, "error": "line too long"})
+                    break
+                if not line:
+                    break  # client disconnected
+
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError
+                except ValueError:
+                    await respond({"ok": False, "error": "invalid JSON"})
+                    continue
+
+                task = asyncio.create_task(run(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            for game_id in owned:
+                self._close(game_id)
+            writer.close()
+
+    # ---------------- Commands ----------------
+    async def dispatch(self, request: dict, owned: Set[str]) -> dict:
+        command = request.get("cmd")
+
+        if command == "new_game":
+            session = self._new_session(request)
+            owned.add(session.game_id)
+            async with session.lock:
+                ai_move = await self._engine_turn(session)
+            return self._reply(session, ai_move)
+
+        session = self._session(request, owned)
+
+        if command == "state":
+            return self._reply(session)
+
+        if command == "close":
+            self._close(session.game_id)
+            owned.discard(session.game_id)
+            return {"ok": True, "game_id": session.game_id}
+
+        if command == "move":
+            async with session.lock:
+                if session.is_over():
+                    raise ProtocolError("game is over")
+                if session.state.turn == session.ai_color:
+                    raise ProtocolError("not your turn")
+                session.play(str(request.get("move", "")))
+                ai_move = await self._engine_turn(session)
+            return self._reply(session, ai_move)
+
+        if command == "go":
+            async with session.lock:
+                if session.is_over():
+                    raise ProtocolError("game is over")
+                ai_move = await self._search(session)
+            return self._reply(session, ai_move)
+
+        raise ProtocolError(f"unknown command: {command}")
+
+    def _new_session(self, request: dict) -> Session:
+        ai_color = request.get("ai_color", "black")
+        if ai_color is not None and ai_color not in COLORS:
+            raise ProtocolError(f"invalid ai_color: {ai_color}")
+
+        try:
+            depth = min(int(request.get("depth", 3)), MAX_DEPTH)
+            move_time = min(float(request.get("move_time", DEFAULT_MOVE_TIME)), MAX_MOVE_TIME)
+        except (TypeError, ValueError):
+            raise ProtocolError("invalid depth or move_time")
+        if depth < 1 or move_time <= 0:
+            raise ProtocolError("invalid depth or move_time")
+
+        game_id = f"g{next(self._ids)}"
+        session = Session(game_id, COLORS.get(ai_color), depth, move_time)
+        self.sessions[game_id] = session
+        return session
+
+    def _session(self, request: dict, owned: Set[str]) -> Session:
+        game_id = request.get("game_id")
+        if game_id not in owned or game_id not in self.sessions:
+            raise ProtocolError(f"unknown game: {game_id}")
+        return self.sessions[game_id]
+
+    def _close(self, game_id: str):
+        session = self.sessions.pop(game_id, None)
+        if session and session.search:
+            session.search.cancel()
+
+    def _reply(self, session: Session, ai_move: Optional[str] = None) -> dict:
+        response = {"ok": True, **session.describe()}
+        if ai_move:
+            response["ai_move"] = ai_move
+        return response
+
+    # ---------------- Engine ----------------
+    async def _engine_turn(self, session: Session) -> Optional[str]:
+        if session.state.turn != session.ai_color or session.is_over():
+            return None
+        return await self._search(session)
+
+    async def _search(self, session: Session) -> Optional[str]:
+        """
+        Runs the engine for the side to move in the pool and plays its move.
+        """
+        async with self.pending:
+            slot = self.free_slots.pop()
+            self.stop_flags[slot] = 0
+            job = self.executor.submit(
+                search_worker,
+                Snapshot.from_state(session.state).to_bytes(), session.depth, session.move_time, slot,
+            )
+            session.search = asyncio.wrap_future(job)
+            try:
+                ai_move = await asyncio.wait_for(session.search, session.move_time + WORKER_GRACE)
+            except asyncio.TimeoutError:
+                # The client's move (if any) has been played: send the game along
+                raise ProtocolError("engine timed out", session.describe())
+            finally:
+                session.search = None
+                try:
+                    if not job.done():
+                        # Cancelling only drops a queued job: stop a running
+                        # one and keep its slot until the worker is free again
+                        self.stop_flags[slot] = 1
+                        await asyncio.wait([asyncio.wrap_future(job)])
+                finally:
+                    self.free_slots.append(slot)
+
+        if ai_move is None:
+            return None
+        return session.play(ai_move)
+
+
+# --------------------------------------------------
+# Entry Point
+# --------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Chess AI game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, default=2, help="engine worker processes")
+    args = parser.parse_args()
+
+    async def run():
+        server = GameServer(workers=args.workers)
+        try:
+            if args.unix:
+                await server.serve_unix(args.unix)
+            else:
+                await server.serve_tcp(args.host, args.port)
+        finally:
+            server.shutdown()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
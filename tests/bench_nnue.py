@@ -0,0 +1,70 @@
+"""
+Benchmark: NNUE evaluation against the hand-written evaluator.
+
+Reports evaluations per second for Evaluator and for the network
+(forward pass on a maintained accumulator, and with a full accumulator
+refresh), plus the cost the accumulator adds to make_move/undo_move.
+Needs NumPy. The incremental updates are checked against the reference
+forward pass in tests/test_nnue.py.
+
+    python -m tests.bench_nnue [weights.npz]
+
+Without a weights file an untrained random network of the default size
+is used; speed does not depend on the values of the weights.
+"""
+import sys
+import timeit
+from typing import List
+
+from game.state import GameState
+from ai.evaluation import Evaluator
+from ai.nnue import Network, load_weights, random_weights
+from tests.benchmarks import build_positions
+
+
+def per_second(func, positions: List[GameState]) -> float:
+    def sweep():
+        for state in positions:
+            func(state)
+
+    timer = timeit.Timer(sweep)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=5, number=number))
+    return number * len(positions) / best
+
+
+def make_undo_all(state: GameState):
+    for move in state.get_legal_moves():
+        state.make_move(move)
+        state.undo_move()
+
+
+def main():
+    weights = load_weights(sys.argv[1]) if len(sys.argv) > 1 else random_weights()
+    network = Network(weights)
+
+    positions = build_positions()
+    plain = per_second(make_undo_all, positions)
+
+    rates = [
+        ("Evaluator.static_eval", per_second(Evaluator.static_eval, positions)),
+        ("Evaluator.evaluate", per_second(Evaluator.evaluate, positions)),
+        ("NNUE (refresh)", per_second(network.evaluate, positions)),
+    ]
+    for state in positions:
+        state.accumulator = network.accumulator(state)
+    rates.append(("NNUE (incremental)", per_second(network.evaluate, positions)))
+    with_accumulator = per_second(make_undo_all, positions)
+
+    print(f"hidden size {network.hidden}, {len(positions)} positions")
+    print(f"{'':24}{'evals/s':>12}")
+    for name, rate in rates:
+        print(f"{name:24}{rate:>12.0f}")
+    print(
+        f"make/undo of all legal moves: {plain:.0f}/s without accumulator, "
+        f"{with_accumulator:.0f}/s with ({with_accumulator / plain:.0%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: effect of SEE pruning on quiescence search.
+
+Searches a fixed set of positions with and without skipping captures
+that lose material, and reports quiescence nodes, total nodes and time.
+
+    python -m tests.bench_see [depth]
+"""
+import random
+import sys
+import time
+from typing import List
+
+from game.state import GameState
+from ai.minimax import MinimaxAI
+
+# Positions are reached by seeded random play: reproducible, and full of
+# the loose pieces and lopsided exchanges that quiescence has to resolve.
+POSITION_SEEDS = range(8)
+RANDOM_PLIES = 16
+
+
+def build_positions() -> List[GameState]:
+    positions = []
+    for seed in POSITION_SEEDS:
+        rng = random.Random(seed)
+        state = GameState()
+        for _ in range(RANDOM_PLIES):
+            moves = state.get_legal_moves()
+            if not moves:
+                break
+            state.make_move(rng.choice(moves))
+        positions.append(state)
+    return positions
+
+
+def run(depth: int, see_pruning: bool) -> dict:
+    totals = {"qnodes": 0, "nodes": 0, "seconds": 0.0, "moves": []}
+    for state in build_positions():
+        ai = MinimaxAI(depth=depth, see_pruning=see_pruning)
+        start = time.perf_counter()
+        result = ai.search(state)
+        totals["seconds"] += time.perf_counter() - start
+        totals["qnodes"] += ai.qnodes
+        totals["nodes"] += ai.nodes
+        totals["moves"].append(result.move and (result.move.start, result.move.end))
+    return totals
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    without = run(depth, see_pruning=False)
+    with_see = run(depth, see_pruning=True)
+
+    print(f"depth {depth}, {len(POSITION_SEEDS)} positions")
+    print(f"{'':14}{'qnodes':>10}{'nodes':>10}{'seconds':>10}")
+    for name, totals in [("no SEE", without), ("SEE pruning", with_see)]:
+        print(f"{name:14}{totals['qnodes']:>10}{totals['nodes']:>10}{totals['seconds']:>10.2f}")
+
+    if without["qnodes"]:
+        print(f"quiescence nodes: {with_see['qnodes'] / without['qnodes']:.0%} of baseline")
+    same = sum(a == b for a, b in zip(without["moves"], with_see["moves"]))
+    print(f"same best move in {same}/{len(POSITION_SEEDS)} positions")
+
+
+if __name__ == "__main__":
+    main()
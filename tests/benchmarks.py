@@ -0,0 +1,207 @@
+"""
+Micro-benchmarks for the engine's hot paths, with regression checks.
+
+Each path is timed separately over a fixed corpus of positions:
+pseudo-legal move generation, legality filtering, check detection,
+evaluation, and a fixed-depth search (node count and nodes per second).
+
+    python -m tests.benchmarks run [--depth 3] [--out results.json]
+    python -m tests.benchmarks compare baseline.json [results.json] [--threshold 0.15]
+
+`run` prints the results as JSON and optionally writes them to a file;
+keep one as the baseline. `compare` checks a results file (or a fresh
+run) against the baseline and exits with status 1 if any metric got
+worse by more than the threshold (15% by default).
+"""
+from typing import Callable, Dict, List, Optional
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+
+from game.piece import Color
+from game.state import GameState
+from game.snapshot import Snapshot
+from ai.evaluation import Evaluator
+from ai.minimax import MinimaxAI
+from tests.helpers import POSITIONS
+
+CORPUS = POSITIONS
+
+DEFAULT_DEPTH = 3
+DEFAULT_REPEAT = 5
+DEFAULT_SEARCH_REPEAT = 3
+# Timings of unchanged code vary by several percent between runs
+DEFAULT_THRESHOLD = 0.15
+
+
+def build_positions() -> List[GameState]:
+    return [Snapshot.from_fen(fen).to_state() for _, fen in CORPUS]
+
+
+# --------------------------------------------------
+# Measurements
+# --------------------------------------------------
+def metric(value: float, unit: str, lower_is_better: bool = True) -> dict:
+    return {"value": value, "unit": unit, "lower_is_better": lower_is_better}
+
+
+def time_per_position(func: Callable[[GameState], object], positions: List[GameState], repeat: int) -> float:
+    """
+    Best-of-`repeat` time of one call of `func`, averaged over the
+    corpus, in microseconds.
+    """
+    def sweep():
+        for state in positions:
+            func(state)
+
+    timer = timeit.Timer(sweep)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number / len(positions) * 1e6
+
+
+def check_detection(state: GameState):
+    state.is_in_check(Color.WHITE)
+    state.is_in_check(Color.BLACK)
+
+
+def search_metrics(positions: List[GameState], depth: int, repeat: int) -> Dict[str, dict]:
+    """
+    Fixed-depth search of every position with a fresh engine. The node
+    count is deterministic; the time is the best of `repeat` sweeps.
+    """
+    seconds = float("inf")
+    for _ in range(repeat):
+        nodes = 0
+        elapsed = 0.0
+        for state in positions:
+            ai = MinimaxAI(depth=depth)
+            start = time.perf_counter()
+            ai.search(state)
+            elapsed += time.perf_counter() - start
+            nodes += ai.nodes
+        seconds = min(seconds, elapsed)
+
+    return {
+        "search.nodes": metric(nodes, "nodes"),
+        "search.seconds": metric(seconds, "s"),
+        "search.nps": metric(nodes / seconds if seconds else 0.0, "nodes/s", lower_is_better=False),
+    }
+
+
+def run(
+    depth: int = DEFAULT_DEPTH, repeat: int = DEFAULT_REPEAT, search_repeat: int = DEFAULT_SEARCH_REPEAT
+) -> dict:
+    positions = build_positions()
+    results = {
+        "movegen.pseudo_legal": metric(
+            time_per_position(lambda s: s.rules.generate_pseudo_legal_moves(s.turn), positions, repeat), "us"
+        ),
+        "movegen.legal": metric(time_per_position(GameState.get_legal_moves, positions, repeat), "us"),
+        "check.is_in_check": metric(time_per_position(check_detection, positions, repeat), "us"),
+        "eval.static": metric(time_per_position(Evaluator.static_eval, positions, repeat), "us"),
+        "eval.evaluate": metric(time_per_position(Evaluator.evaluate, positions, repeat), "us"),
+    }
+    results.update(search_metrics(positions, depth, search_repeat))
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "depth": depth,
+            "repeat": repeat,
+            "search_repeat": search_repeat,
+            "positions": [name for name, _ in CORPUS],
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+# --------------------------------------------------
+# Comparison
+# --------------------------------------------------
+def compare(baseline: dict, current: dict, threshold: float) -> List[str]:
+    """
+    Prints a comparison table and returns the names of the metrics that
+    regressed by more than `threshold` (a fraction, 0.10 = 10%).
+    """
+    regressions = []
+    if baseline["meta"].get("depth") != current["meta"].get("depth"):
+        print(
+            f"warning: search depth differs (baseline {baseline['meta'].get('depth')}, "
+            f"current {current['meta'].get('depth')})"
+        )
+
+    print(f"{'metric':24}{'baseline':>14}{'current':>14}{'change':>10}")
+    for name, base in baseline["results"].items():
+        result = current["results"].get(name)
+        if result is None:
+            print(f"{name:24}{base['value']:>14.4g}{'missing':>14}")
+            continue
+
+        old, new = base["value"], result["value"]
+        change = (new - old) / old if old else 0.0
+        worse = change > threshold if base["lower_is_better"] else change < -threshold
+        flag = "  REGRESSION" if worse else ""
+        print(f"{name:24}{old:>14.4g}{new:>14.4g}{change:>+10.1%}{flag}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+# --------------------------------------------------
+# Entry Point
+# --------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Engine micro-benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks and print JSON results")
+    run_parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    run_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    run_parser.add_argument("--search-repeat", type=int, default=DEFAULT_SEARCH_REPEAT)
+    run_parser.add_argument("--out", help="also write the results to this file")
+
+    compare_parser = commands.add_parser("compare", help="compare results against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("results", nargs="?", help="results file (default: run now)")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    compare_parser.add_argument("--search-repeat", type=int, default=DEFAULT_SEARCH_REPEAT)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = run(args.depth, args.repeat, args.search_repeat)
+        text = json.dumps(results, indent=2)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as handle:
+                handle.write(text + "\n")
+        print(text)
+        return 0
+
+    baseline = load(args.baseline)
+    if args.results:
+        current = load(args.results)
+    else:
+        current = run(baseline["meta"]["depth"], args.repeat, args.search_repeat)
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"no regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Positions and helpers shared by the tests and benchmarks.
+"""
+from typing import List, Tuple
+import random
+
+from game.state import GameState
+from game.notation import parse_uci
+from game.snapshot import Snapshot
+
+# Standard test positions: opening, castling and en passant tangles,
+# promotions, and endgames
+START = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+ROOK_ENDGAME = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"
+PROMOTIONS = "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+MIDDLEGAME = "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8"
+ITALIAN = "r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/3P1N2/PPP2PPP/RNBQK2R w KQkq - 4 5"
+
+POSITIONS: List[Tuple[str, str]] = [
+    ("start", START),
+    ("kiwipete", KIWIPETE),
+    ("rook_endgame", ROOK_ENDGAME),
+    ("promotions", PROMOTIONS),
+    ("middlegame", MIDDLEGAME),
+    ("italian", ITALIAN),
+]
+
+# White to capture en passant on f6
+EN_PASSANT = "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3"
+# Both sides free to castle either way
+CASTLING = "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1"
+
+KNIGHT_SHUFFLE = ("g1f3", "g8f6", "f3g1", "f6g8")
+
+# A game from the start with double pawn pushes, en passant, castling,
+# checks and a promotion with capture
+SPECIAL_MOVES = (
+    "e2e4", "d7d5", "e4e5", "f7f5", "e5f6", "g8h6", "g1f3", "e8f7",
+    "f1c4", "f7g6", "e1g1", "b7b5", "f6g7", "b5c4", "g7f8q",
+)
+
+
+def state_from_fen(fen: str) -> GameState:
+    return Snapshot.from_fen(fen).to_state()
+
+
+def play(state: GameState, *moves: str):
+    """
+    Plays UCI moves on `state`, failing the test on an illegal one.
+    """
+    for uci in moves:
+        move = parse_uci(uci, state)
+        assert move is not None, uci
+        state.make_move(move)
+
+
+def random_game(seed: int, min_plies: int = 6, max_plies: int = 40) -> GameState:
+    """
+    Plays a reproducible random game from the start, stopping early if
+    it ends. The result still has a legal move.
+    """
+    rng = random.Random(seed)
+    state = GameState()
+    for _ in range(rng.randrange(min_plies, max_plies)):
+        moves = state.get_legal_moves()
+        if len(moves) == 0:
+            break
+        state.make_move(rng.choice(moves))
+    while not state.get_legal_moves():
+        state.undo_move()
+    return state
@@ -0,0 +1,533 @@
+from collections import Counter
+import math
+
+import pytest
+
+from game.piece import Color
+from game.state import GameState
+from game.notation import move_to_uci, parse_uci
+from ai.engine import ChessAI
+from ai.evaluation import Evaluator
+from ai.minimax import MinimaxAI
+from ai.move_ordering import MovePicker, move_key
+from ai.pawn_table import PawnTable
+from ai.see import is_good_capture, see
+from ai.time_manager import FakeClock, SearchTimeout, TimeManager
+from tests.helpers import EN_PASSANT, ITALIAN, KIWIPETE, MIDDLEGAME, PROMOTIONS, ROOK_ENDGAME, play, random_game, state_from_fen
+
+
+# --------------------------------------------------
+# Time Management
+# --------------------------------------------------
+def make_manager() -> TimeManager:
+    return TimeManager(FakeClock(), move_overhead=0.05)
+
+
+def test_start_splits_remaining_time():
+    tm = make_manager()
+    tm.start(60.0)
+    assert tm.soft_limit == pytest.approx(2.0)  # 60 s over 30 moves
+    assert tm.hard_limit == pytest.approx(8.0)  # 4 x soft
+
+
+def test_start_uses_increment():
+    tm = make_manager()
+    tm.start(60.0, increment=1.0)
+    assert tm.soft_limit == pytest.approx(2.75)
+    assert tm.hard_limit == pytest.approx(11.0)
+
+
+def test_start_caps_hard_limit_by_remaining_time():
+    tm = make_manager()
+    tm.start(10.0, moves_to_go=2)
+    assert tm.soft_limit == pytest.approx(5.0)
+    assert tm.hard_limit == pytest.approx(5.0)  # half the remaining time
+
+
+def test_start_last_move_before_time_control():
+    tm = make_manager()
+    tm.start(10.0, moves_to_go=1)
+    assert tm.hard_limit == pytest.approx(9.95)
+    assert tm.soft_limit == pytest.approx(9.95)
+
+
+def test_start_fixed_keeps_move_overhead():
+    tm = make_manager()
+    tm.start_fixed(1.0)
+    assert tm.soft_limit == tm.hard_limit == pytest.approx(0.95)
+    tm.start_fixed(0.01)
+    assert tm.hard_limit == 0.0
+
+
+def test_stable_best_move_stops_at_fraction_of_soft_limit():
+    tm = make_manager()
+    tm.start(60.0)
+    tm.clock.advance(1.0)
+    assert not tm.iteration_finished(("e2", "e4"), 0.0)
+    tm.clock.advance(0.5)
+    assert tm.iteration_finished(("e2", "e4"), 0.0)
+
+
+def test_changed_best_move_extends_soft_limit():
+    tm = make_manager()
+    tm.start(60.0)
+    tm.clock.advance(1.0)
+    tm.iteration_finished(("e2", "e4"), 0.0)
+    tm.clock.advance(0.5)
+    assert not tm.iteration_finished(("d2", "d4"), 0.0)
+
+
+def test_score_drop_extends_soft_limit():
+    tm = make_manager()
+    tm.start(60.0)
+    tm.clock.advance(1.0)
+    tm.iteration_finished(("e2", "e4"), 0.0)
+    tm.clock.advance(0.5)
+    assert not tm.iteration_finished(("e2", "e4"), -0.5)
+
+
+def test_forced_move_stops_at_once():
+    tm = make_manager()
+    tm.start(60.0)
+    assert tm.iteration_finished(("e2", "e4"), 0.0, forced=True)
+
+
+def test_check_raises_at_hard_limit():
+    tm = make_manager()
+    tm.start_fixed(1.0)
+    tm.check()
+    tm.clock.advance(1.0)
+    with pytest.raises(SearchTimeout):
+        tm.check()
+
+
+def test_hard_limit_abort_returns_last_completed_iteration():
+    state = state_from_fen(KIWIPETE)
+    zobrist_hash = state.zobrist_hash
+    history = list(state.move_history)
+
+    # Every clock read takes 10 ms: the search runs out mid-iteration
+    tm = TimeManager(FakeClock(tick=0.01), move_overhead=0.0)
+    tm.start_fixed(1.0)
+    ai = MinimaxAI(depth=20)
+    result = ai.search(state, tm)
+
+    assert 1 <= result.depth < 20
+    assert state.zobrist_hash == zobrist_hash
+    assert state.move_history == history
+
+    # Same move and score as a plain search to the completed depth
+    full = MinimaxAI(depth=result.depth).search(state_from_fen(KIWIPETE))
+    assert move_to_uci(result.move) == move_to_uci(full.move)
+    assert result.score == full.score
+
+
+def test_depth_limits_timed_search():
+    result = ChessAI(Color.WHITE, depth=1).search(GameState(), move_time=5.0)
+    assert result.depth == 1
+
+
+# --------------------------------------------------
+# Static Exchange Evaluation
+# --------------------------------------------------
+def see_of(fen: str, uci: str) -> float:
+    state = state_from_fen(fen)
+    move = parse_uci(uci, state)
+    assert move is not None
+    return see(state, move)
+
+
+def test_see_queen_takes_pawn_defended_by_pawn():
+    assert see_of("4k3/8/4p3/3p4/8/8/8/3QK3 w - - 0 1", "d1d5") == -8
+
+
+def test_see_rook_takes_rook_backed_by_xray_rook():
+    # Rd2xd7 Rxd7 Rxd7: the d1 rook joins once d2 has moved
+    assert see_of("3r3k/3r4/8/8/8/8/3R4/3R3K w - - 0 1", "d2d7") == 5
+    # Without it the exchange only breaks even
+    assert see_of("3r3k/3r4/8/8/8/8/3R4/7K w - - 0 1", "d2d7") == 0
+
+
+def test_see_king_does_not_recapture_defended_square():
+    # Qxf7+: the king can't take back because the c4 bishop covers f7
+    assert see_of("4k3/5p2/8/8/2B5/5Q2/8/4K3 w - - 0 1", "f3f7") == 1
+    # Undefended, the king wins the queen
+    assert see_of("4k3/5p2/8/8/8/5Q2/8/4K3 w - - 0 1", "f3f7") == -8
+
+
+# --------------------------------------------------
+# Pawn Structure
+# --------------------------------------------------
+def square_bit(name: str) -> int:
+    col, row = ord(name[0]) - ord("a"), 8 - int(name[1])
+    return 1 << (row * 8 + col)
+
+
+def pawn_structure(fen: str):
+    return Evaluator.pawn_structure(state_from_fen(fen))
+
+
+def test_doubled_pawns():
+    # e2/e3 doubled; nothing isolated, passed or backward on either side
+    score, white_passed, black_passed = pawn_structure("4k3/3ppp2/8/8/8/4P3/3PP3/4K3 w - - 0 1")
+    assert score == pytest.approx(-Evaluator.DOUBLED_PAWN_PENALTY)
+    assert white_passed == black_passed == 0
+
+
+def test_isolated_pawn():
+    # a2 is isolated, and passed from its starting rank (no bonus yet)
+    score, white_passed, _ = pawn_structure("4k3/8/8/8/8/8/P7/4K3 w - - 0 1")
+    assert score == pytest.approx(-Evaluator.ISOLATED_PAWN_PENALTY)
+    assert white_passed == square_bit("a2")
+
+
+def test_passed_pawns():
+    # d5/e5 passed three ranks up; h7 passed (no bonus) but isolated
+    score, white_passed, black_passed = pawn_structure("4k3/7p/8/3PP3/8/8/8/4K3 w - - 0 1")
+    bonus = Evaluator.PASSED_PAWN_BONUS[3]
+    assert score == pytest.approx(2 * bonus + Evaluator.ISOLATED_PAWN_PENALTY)
+    assert white_passed == square_bit("d5") | square_bit("e5")
+    assert black_passed == square_bit("h7")
+
+
+def test_backward_pawn():
+    # d2 lags behind c4 and the e4 pawn guards d3; with the black pawn
+    # on e3 instead, d3 is safe and nothing else changes
+    backward, white_passed, _ = pawn_structure("4k3/8/8/8/2P1p3/8/3P4/4K3 w - - 0 1")
+    safe, _, _ = pawn_structure("4k3/8/8/8/2P5/4p3/3P4/4K3 w - - 0 1")
+    assert safe - backward == pytest.approx(Evaluator.BACKWARD_PAWN_PENALTY)
+    assert white_passed == square_bit("c4")
+
+
+def test_pawn_table_stores_passed_masks():
+    state = state_from_fen("4k3/7p/8/3PP3/8/8/8/4K3 w - - 0 1")
+    table = PawnTable()
+    Evaluator.static_eval(state, table)
+    entry = table.probe(state.pawn_hash)
+    assert entry is not None
+    assert entry.score == pytest.approx(Evaluator.pawn_structure(state)[0])
+    assert entry.white_passed == square_bit("d5") | square_bit("e5")
+    assert entry.black_passed == square_bit("h7")
+    assert Evaluator.static_eval(state, table) == Evaluator.static_eval(state)
+
+
+def test_search_reports_pawn_table_hits():
+    ai = MinimaxAI(depth=3)
+    ai.search(state_from_fen(ITALIAN))
+    statistics = ai.statistics()
+    assert statistics["pawn_hits"] > 0
+    assert 0 < statistics["pawn_hit_rate"] <= 1
+    assert statistics["pawn_hit_rate"] == statistics["pawn_hits"] / statistics["pawn_probes"]
+
+
+# --------------------------------------------------
+# Move Ordering
+# --------------------------------------------------
+PICKER_POSITIONS = [KIWIPETE, PROMOTIONS, EN_PASSANT]
+
+# Not a pseudo-legal move in any of the positions above
+IMPOSSIBLE_KILLER = ((4, 4), (0, 0), None)
+
+
+def picked(picker: MovePicker) -> Counter:
+    return Counter(move_to_uci(move) for move in picker)
+
+
+def pseudo_legal(state: GameState) -> Counter:
+    return Counter(move_to_uci(move) for move in state.rules.generate_pseudo_legal_moves(state.turn))
+
+
+@pytest.mark.parametrize("fen", PICKER_POSITIONS)
+def test_move_picker_yields_every_move_once(fen):
+    state = state_from_fen(fen)
+    captures = state.rules.generate_captures(state.turn)
+    quiets = state.rules.generate_quiet_moves(state.turn)
+
+    hints = [
+        (None, []),
+        # A quiet hash move, also given as a killer
+        (move_key(quiets[0]), [move_key(quiets[0]), move_key(quiets[-1])]),
+        # A capture as hash move, and a killer that can't be played here
+        (move_key(captures[0]), [IMPOSSIBLE_KILLER, move_key(quiets[1])]),
+    ]
+    for hash_move, killers in hints:
+        picker = MovePicker(state, hash_move, killers, {move_key(quiets[2]): 100})
+        assert picked(picker) == pseudo_legal(state)
+
+        moves = list(MovePicker(state, hash_move, killers))
+        if hash_move is not None:
+            assert move_key(moves[0]) == hash_move
+
+
+@pytest.mark.parametrize("fen", PICKER_POSITIONS)
+def test_move_picker_captures_only(fen):
+    state = state_from_fen(fen)
+    captures = state.rules.generate_captures(state.turn)
+    quiet = state.rules.generate_quiet_moves(state.turn)[0]
+
+    # A quiet hash move is not a capture: it is left out
+    moves = list(MovePicker(state, move_key(quiet), captures_only=True))
+    assert all(move.is_capture() or move.is_promotion() for move in moves)
+    assert picked(iter(moves)) == Counter(move_to_uci(move) for move in captures)
+
+    kept = picked(MovePicker(state, captures_only=True, skip_bad_captures=True))
+    good = {move_to_uci(move) for move in captures if is_good_capture(state, move)}
+    assert set(kept) == good
+    assert max(kept.values()) == 1
+    for move in captures:
+        if move_to_uci(move) not in good:
+            assert see(state, move) < 0
+
+
+# --------------------------------------------------
+# Search
+# --------------------------------------------------
+TOGGLES = ("null_move", "late_move_reductions", "futility_pruning")
+NO_PRUNING = {toggle: False for toggle in TOGGLES}
+
+
+def reference_negamax(ai: MinimaxAI, state: GameState, depth: int, alpha: float, beta: float, ply: int) -> float:
+    """
+    Plain fail-hard alpha-beta: no transposition table, PVS, aspiration
+    windows or pruning, but the same draw rules and leaves (quiescence)
+    as MinimaxAI.
+    """
+    if state.is_fifty_move_draw() or state.is_repetition() or state.is_insufficient_material():
+        return 0.0
+    if depth <= 0:
+        return ai._quiescence(state, alpha, beta, ply)
+
+    moves = state.get_legal_moves()
+    if not moves:
+        return -(Evaluator.MATE_SCORE - ply) if state.is_in_check(state.turn) else 0.0
+
+    # Captures first, only to cut the node count
+    moves.sort(key=lambda move: not move.is_capture())
+    for move in moves:
+        state.make_move(move)
+        score = -reference_negamax(ai, state, depth - 1, -beta, -alpha, ply + 1)
+        state.undo_move()
+        if score >= beta:
+            return beta
+        alpha = max(alpha, score)
+    return alpha
+
+
+def reference_score(state: GameState, depth: int) -> float:
+    """
+    Full-window score of `state` at `depth`, White positive.
+    """
+    sign = 1 if state.turn == Color.WHITE else -1
+    return sign * reference_negamax(MinimaxAI(), state, depth, -math.inf, math.inf, 0)
+
+
+def count_null_moves(monkeypatch) -> list:
+    calls = []
+    make_null_move = GameState.make_null_move
+
+    def counting(state):
+        calls.append(state.zobrist_hash)
+        make_null_move(state)
+
+    monkeypatch.setattr(GameState, "make_null_move", counting)
+    return calls
+
+
+@pytest.mark.parametrize("toggle", TOGGLES)
+def test_each_toggle_saves_nodes(toggle):
+    on = MinimaxAI(depth=4)
+    on.search(state_from_fen(ITALIAN))
+    off = MinimaxAI(depth=4, **{toggle: False})
+    off.search(state_from_fen(ITALIAN))
+    assert off.nodes > on.nodes
+
+
+def test_null_move_not_tried_in_pawn_endings(monkeypatch):
+    calls = count_null_moves(monkeypatch)
+    state = state_from_fen("8/5k2/3p4/1p1P4/1P2K3/8/8/8 w - - 0 1")
+    MinimaxAI(depth=5).search(state)
+    assert calls == []
+    assert state.null_move_count == 0
+
+
+def test_null_move_tried_with_pieces(monkeypatch):
+    calls = count_null_moves(monkeypatch)
+    MinimaxAI(depth=4).search(state_from_fen(ITALIAN))
+    assert calls
+
+
+@pytest.mark.parametrize("fen", [ITALIAN, KIWIPETE, MIDDLEGAME, ROOK_ENDGAME])
+def test_search_without_pruning_matches_reference(fen):
+    result = MinimaxAI(depth=3, **NO_PRUNING).search(state_from_fen(fen))
+    assert result.score == pytest.approx(reference_score(state_from_fen(fen), 3))
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_pvs_and_aspiration_match_reference_on_random_positions(seed):
+    state = random_game(seed)
+    result = MinimaxAI(depth=3, **NO_PRUNING).search(state)
+    assert result.score == pytest.approx(reference_score(state, 3))
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_principal_variation_is_legal(seed):
+    state = random_game(seed)
+    result = MinimaxAI(depth=3).search(state)
+    assert result.pv and result.pv[0] is result.move
+    for move in result.pv:
+        legal = parse_uci(move_to_uci(move), state)
+        assert legal is not None, move_to_uci(move)
+        state.make_move(legal)
+
+
+# Re8+ Rxe8 Rxe8#, and the same with colours reversed
+MATE_IN_TWO = "r5k1/5ppp/8/8/8/8/4RPPP/4R1K1 w - - 0 1"
+MATED_IN_TWO = "4r1k1/4rppp/8/8/8/8/5PPP/R5K1 b - - 0 1"
+
+
+@pytest.mark.parametrize("depth", [3, 5])
+def test_mate_in_two_scores_distance_to_mate(depth):
+    result = MinimaxAI(depth=depth).search(state_from_fen(MATE_IN_TWO))
+    assert result.score == Evaluator.MATE_SCORE - 3
+    assert [move_to_uci(move) for move in result.pv] == ["e2e8", "a8e8", "e1e8"]
+
+    result = MinimaxAI(depth=depth).search(state_from_fen(MATED_IN_TWO))
+    assert result.score == -(Evaluator.MATE_SCORE - 3)
+
+
+def test_shorter_mate_preferred():
+    # Re8# at once, though slower mates are also available
+    result = MinimaxAI(depth=5).search(state_from_fen("6k1/5ppp/8/8/8/8/4RPPP/4R1K1 w - - 0 1"))
+    assert result.score == Evaluator.MATE_SCORE - 1
+    assert len(result.pv) == 1 and move_to_uci(result.move) in ("e1e8", "e2e8")
+
+
+def test_search_reports_eval_cache_hits():
+    ai = MinimaxAI(depth=3)
+    ai.search(state_from_fen(ITALIAN))
+    statistics = ai.statistics()
+    assert statistics["eval_hits"] > 0
+    assert statistics["eval_probes"] >= statistics["eval_hits"]
+
+
+# --------------------------------------------------
+# Multi-PV
+# --------------------------------------------------
+def root_move_scores(state: GameState, depth: int) -> dict:
+    """
+    Reference score of every root move searched on its own, keyed by
+    UCI, from the side to move's point of view.
+    """
+    ai = MinimaxAI()
+    scores = {}
+    for move in state.get_legal_moves():
+        state.make_move(move)
+        scores[move_to_uci(move)] = -reference_negamax(ai, state, depth - 1, -math.inf, math.inf, 1)
+        state.undo_move()
+    return scores
+
+
+@pytest.mark.parametrize("fen", [ITALIAN, MIDDLEGAME, ROOK_ENDGAME])
+def test_multi_pv_scores_match_separate_root_searches(fen):
+    state = state_from_fen(fen)
+    sign = 1 if state.turn == Color.WHITE else -1
+    expected = sorted(root_move_scores(state, 3).values(), reverse=True)[:3]
+
+    *_, last = MinimaxAI(depth=3, **NO_PRUNING).analyse(state, lines=3)
+    assert [sign * result.score for result in last] == pytest.approx(expected)
+
+
+def test_multi_pv_lines_are_distinct_and_sorted():
+    state = state_from_fen(KIWIPETE)
+    sign = 1 if state.turn == Color.WHITE else -1
+    iterations = list(MinimaxAI(depth=3).analyse(state, lines=4))
+
+    # One list per depth
+    assert [results[0].depth for results in iterations] == [1, 2, 3]
+    for results in iterations:
+        assert len(results) == 4
+        assert len({move_to_uci(result.move) for result in results}) == 4
+        assert all(result.pv[0] is result.move for result in results)
+        scores = [sign * result.score for result in results]
+        assert scores == sorted(scores, reverse=True)
+
+
+def test_multi_pv_lines_capped_by_legal_moves():
+    # Black's king has three moves
+    state = state_from_fen("k7/8/8/8/8/8/8/4K2R b - - 0 1")
+    for results in MinimaxAI(depth=2).analyse(state, lines=5):
+        assert sorted(move_to_uci(result.move) for result in results) == ["a8a7", "a8b7", "a8b8"]
+
+
+def test_closing_analysis_early_restores_position():
+    state = state_from_fen(ITALIAN)
+    before = (state.zobrist_hash, [move_to_uci(move) for move in state.move_history])
+
+    analysis = MinimaxAI(depth=6).analyse(state, lines=3)
+    first = next(analysis)
+    assert first[0].depth == 1
+    analysis.close()
+
+    assert (state.zobrist_hash, [move_to_uci(move) for move in state.move_history]) == before
+    assert state.null_move_count == 0
+
+
+# --------------------------------------------------
+# Between Moves
+# --------------------------------------------------
+def record_root_depths(monkeypatch, ai: MinimaxAI) -> list:
+    depths = []
+    search_root = ai._search_root
+
+    def recording(state, depth, *args):
+        depths.append(depth)
+        return search_root(state, depth, *args)
+
+    monkeypatch.setattr(ai, "_search_root", recording)
+    return depths
+
+
+def test_search_resumes_after_predicted_reply(monkeypatch):
+    state = state_from_fen(ITALIAN)
+    ai = MinimaxAI(depth=4)
+    first = ai.search(state)
+    assert len(first.pv) >= 2
+    play(state, *(move_to_uci(move) for move in first.pv[:2]))
+    assert ai._expected_hash == state.zobrist_hash
+
+    depths = record_root_depths(monkeypatch, ai)
+    second = ai.search(state)
+    assert depths[0] == first.depth - 2
+    assert second.depth == 4
+
+
+def test_search_restarts_after_unexpected_reply(monkeypatch):
+    state = state_from_fen(ITALIAN)
+    ai = MinimaxAI(depth=4)
+    first = ai.search(state)
+    play(state, move_to_uci(first.pv[0]))
+    predicted = move_to_uci(first.pv[1])
+    other = next(move for move in state.get_legal_moves() if move_to_uci(move) != predicted)
+    state.make_move(other)
+    assert ai._expected_hash != state.zobrist_hash
+
+    depths = record_root_depths(monkeypatch, ai)
+    ai.search(state)
+    assert depths[0] == 1
+
+
+def test_new_game_forgets_previous_game():
+    state = state_from_fen(ITALIAN)
+    ai = MinimaxAI(depth=4)
+    ai.search(state)
+    assert ai.history and any(ai.killers) and ai.last_result is not None
+
+    ai.new_game()
+    statistics = ai.statistics()
+    assert statistics["nodes"] == statistics["qnodes"] == 0
+    assert statistics["tt_probes"] == statistics["pawn_probes"] == statistics["eval_probes"] == 0
+    assert ai.tt.probe(state.zobrist_hash) is None
+    assert ai.history == {}
+    assert ai.killers == []
+    assert ai.last_result is None
+    assert ai._expected_hash is None
@@ -0,0 +1,117 @@
+from collections import Counter
+
+import pytest
+
+from game.state import GameState
+from game.notation import move_to_uci
+from game.snapshot import Snapshot
+from game import zobrist
+from tests.helpers import EN_PASSANT, KIWIPETE, PROMOTIONS, SPECIAL_MOVES, play, random_game, state_from_fen
+
+
+def perft(state: GameState, depth: int) -> int:
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in state.get_legal_moves():
+        state.make_move(move)
+        nodes += perft(state, depth - 1)
+        state.undo_move()
+    return nodes
+
+
+def assert_hashes(state: GameState):
+    assert state.zobrist_hash == zobrist.compute_hash(
+        state.board, state.turn, state.castling_rights, state.en_passant_target
+    )
+    assert state.pawn_hash == zobrist.compute_pawn_hash(state.board)
+
+
+# --------------------------------------------------
+# Move Generation
+# --------------------------------------------------
+def test_perft_start_position():
+    state = GameState()
+    assert perft(state, 1) == 20
+    assert perft(state, 2) == 400
+    assert perft(state, 3) == 8902
+
+
+def test_perft_kiwipete():
+    state = state_from_fen(KIWIPETE)
+    assert perft(state, 1) == 48
+    assert perft(state, 2) == 2039
+    assert perft(state, 3) == 97862
+
+
+def test_perft_leaves_position_unchanged():
+    state = state_from_fen(KIWIPETE)
+    before = Snapshot.from_state(state)
+    perft(state, 2)
+    assert Snapshot.from_state(state) == before
+
+
+@pytest.mark.parametrize("fen", [KIWIPETE, PROMOTIONS, EN_PASSANT])
+def test_captures_and_quiet_moves_split_pseudo_legal_moves(fen):
+    state = state_from_fen(fen)
+    for color in (state.turn, state.turn.opposite()):
+        captures = state.rules.generate_captures(color)
+        quiets = state.rules.generate_quiet_moves(color)
+        assert all(move.is_capture() or move.is_promotion() for move in captures)
+        assert not any(move.is_capture() or move.is_promotion() for move in quiets)
+
+        split = Counter(move_to_uci(move) for move in captures + quiets)
+        full = Counter(move_to_uci(move) for move in state.rules.generate_pseudo_legal_moves(color))
+        assert split == full
+        assert max(full.values()) == 1
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_captures_and_quiet_moves_split_random_positions(seed):
+    state = random_game(seed)
+    captures = state.rules.generate_captures(state.turn)
+    quiets = state.rules.generate_quiet_moves(state.turn)
+    split = sorted(move_to_uci(move) for move in captures + quiets)
+    assert split == sorted(move_to_uci(move) for move in state.rules.generate_pseudo_legal_moves(state.turn))
+
+
+# --------------------------------------------------
+# Incremental Hashes
+# --------------------------------------------------
+def test_hashes_match_recomputation_after_every_move():
+    special = {"castling": 0, "en_passant": 0, "promotion": 0}
+
+    def count(move):
+        special["castling"] += move.is_castling
+        special["en_passant"] += move.is_en_passant
+        special["promotion"] += move.promotion is not None
+
+    for fen in (KIWIPETE, PROMOTIONS, EN_PASSANT):
+        state = state_from_fen(fen)
+        for move in state.get_legal_moves():
+            count(move)
+            state.make_move(move)
+            assert_hashes(state)
+            # One ply deeper, so moves made from a non-root position count too
+            for reply in state.get_legal_moves():
+                count(reply)
+                state.make_move(reply)
+                assert_hashes(state)
+                state.undo_move()
+            state.undo_move()
+            assert_hashes(state)
+
+    assert all(special.values()), special
+
+
+def test_hashes_restored_along_a_game():
+    state = GameState()
+    start = (state.zobrist_hash, state.pawn_hash)
+    for uci in SPECIAL_MOVES:
+        play(state, uci)
+        assert_hashes(state)
+
+    while state.move_history:
+        state.undo_move()
+        assert_hashes(state)
+    assert (state.zobrist_hash, state.pawn_hash) == start
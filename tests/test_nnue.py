@@ -0,0 +1,135 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from game.state import GameState
+from game.notation import move_to_uci
+from ai.nnue import WEIGHT_NAMES, Network, load_weights, random_weights, reference_forward, save_weights
+from tests.helpers import CASTLING, EN_PASSANT, PROMOTIONS, SPECIAL_MOVES, play, state_from_fen
+
+TOLERANCE = 1e-3
+
+
+@pytest.fixture(scope="module")
+def weights():
+    # Full-strength random units, so every feature moves the output
+    return random_weights(hidden=64, seed=1, noise=1.0)
+
+
+@pytest.fixture(scope="module")
+def network(weights):
+    return Network(weights)
+
+
+def with_accumulator(network: Network, state: GameState) -> GameState:
+    state.accumulator = network.accumulator(state)
+    return state
+
+
+def assert_matches(weights: dict, network: Network, state: GameState):
+    assert state.accumulator is not None
+    incremental = network.evaluate(state)
+    assert abs(incremental - reference_forward(weights, state)) < TOLERANCE, incremental
+
+
+# --------------------------------------------------
+# Incremental Updates
+# --------------------------------------------------
+@pytest.mark.parametrize("seed", range(10))
+def test_incremental_matches_reference_along_random_games(weights, network, seed):
+    rng = random.Random(seed)
+    state = with_accumulator(network, GameState())
+    for _ in range(60):
+        moves = state.get_legal_moves()
+        if not moves:
+            break
+        assert_matches(weights, network, state)
+        state.make_move(rng.choice(moves))
+        if rng.random() < 0.2:
+            state.undo_move()
+    assert_matches(weights, network, state)
+
+
+def test_incremental_matches_reference_for_special_moves(weights, network):
+    special = {"castling": 0, "en_passant": 0, "promotion": 0}
+
+    def count(move):
+        special["castling"] += move.is_castling
+        special["en_passant"] += move.is_en_passant
+        special["promotion"] += move.promotion is not None
+
+    for fen in (CASTLING, EN_PASSANT, PROMOTIONS):
+        state = with_accumulator(network, state_from_fen(fen))
+        for move in state.get_legal_moves():
+            count(move)
+            state.make_move(move)
+            assert_matches(weights, network, state)
+            # Black's promotions come one ply deeper
+            for reply in state.get_legal_moves():
+                count(reply)
+                state.make_move(reply)
+                assert_matches(weights, network, state)
+                state.undo_move()
+            state.undo_move()
+            assert_matches(weights, network, state)
+
+    assert all(special.values()), special
+
+
+def test_incremental_matches_reference_along_a_game(weights, network):
+    state = with_accumulator(network, GameState())
+    for uci in SPECIAL_MOVES:
+        play(state, uci)
+        assert_matches(weights, network, state)
+
+    while state.move_history:
+        state.undo_move()
+        assert_matches(weights, network, state)
+    assert np.allclose(state.accumulator.values, network.accumulator(state).values, atol=1e-5)
+
+
+def test_null_moves_keep_the_accumulator(weights, network):
+    state = with_accumulator(network, state_from_fen(EN_PASSANT))
+    before = state.accumulator.values.copy()
+
+    state.make_null_move()
+    assert_matches(weights, network, state)
+    reply = state.get_legal_moves()[0]
+    state.make_move(reply)
+    assert_matches(weights, network, state)
+    state.undo_move()
+    state.undo_null_move()
+
+    assert_matches(weights, network, state)
+    assert np.array_equal(state.accumulator.values, before)
+    # En passant is available again after the null move is taken back
+    assert "e5f6" in {move_to_uci(move) for move in state.get_legal_moves()}
+
+
+# --------------------------------------------------
+# Weights Files
+# --------------------------------------------------
+def test_npz_round_trip_is_memory_mapped(weights, network, tmp_path):
+    path = str(tmp_path / "weights.npz")
+    save_weights(path, weights)
+    loaded = load_weights(path)
+
+    assert set(loaded) == set(WEIGHT_NAMES)
+    for name in WEIGHT_NAMES:
+        assert isinstance(loaded[name], np.memmap), name
+        assert np.array_equal(loaded[name], weights[name]), name
+
+    state = state_from_fen(PROMOTIONS)
+    assert Network.load(path).evaluate(state) == pytest.approx(network.evaluate(state), abs=1e-6)
+
+
+def test_directory_of_npy_files_is_memory_mapped(weights, tmp_path):
+    for name in WEIGHT_NAMES:
+        np.save(str(tmp_path / (name + ".npy")), weights[name])
+    loaded = load_weights(str(tmp_path))
+
+    for name in WEIGHT_NAMES:
+        assert isinstance(loaded[name], np.memmap), name
+        assert np.array_equal(loaded[name], weights[name]), name
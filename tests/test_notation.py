@@ -0,0 +1,107 @@
+import io
+
+from game.state import GameState
+from game.notation import move_to_san, move_to_uci, parse_san, parse_uci
+from game.pgn import game_to_pgn, read_games
+from tests.helpers import CASTLING, KIWIPETE, SPECIAL_MOVES, play, state_from_fen
+
+
+def san_of(fen: str, uci: str) -> str:
+    state = state_from_fen(fen)
+    move = parse_uci(uci, state)
+    assert move is not None, uci
+    return move_to_san(move, state)
+
+
+# --------------------------------------------------
+# SAN
+# --------------------------------------------------
+def test_san_disambiguates_by_file():
+    assert san_of("1n2k3/8/5n2/8/8/8/8/4K3 b - - 0 1", "b8d7") == "Nbd7"
+
+
+def test_san_disambiguates_by_rank():
+    assert san_of("4k3/8/8/R7/8/8/8/R3K3 w - - 0 1", "a1a3") == "R1a3"
+
+
+def test_san_disambiguates_by_square():
+    assert san_of("8/8/k7/8/4Q2Q/8/8/7Q w - - 0 1", "h4e1") == "Qh4e1"
+
+
+def test_san_promotion():
+    fen = "4k3/P7/8/8/8/8/8/4K3 w - - 0 1"
+    assert san_of(fen, "a7a8q") == "a8=Q+"
+    assert san_of(fen, "a7a8n") == "a8=N"
+
+
+def test_san_castling():
+    assert san_of(CASTLING, "e1g1") == "O-O"
+    assert san_of(CASTLING, "e1c1") == "O-O-O"
+
+    state = state_from_fen(CASTLING)
+    assert move_to_uci(parse_san("O-O-O", state)) == "e1c1"
+    assert move_to_uci(parse_san("0-0", state)) == "e1g1"
+
+
+def test_san_check_and_mate():
+    state = GameState()
+    play(state, "f2f3", "e7e5", "g2g4")
+    mate = parse_uci("d8h4", state)
+    assert move_to_san(mate, state) == "Qh4#"
+    assert san_of("4k3/8/8/8/8/8/8/R3K3 w - - 0 1", "a1a8") == "Ra8+"
+
+
+def test_san_round_trips_every_legal_move():
+    state = state_from_fen(KIWIPETE)
+    for move in state.get_legal_moves():
+        san = move_to_san(move, state)
+        assert move_to_uci(parse_san(san, state)) == move_to_uci(move), san
+
+
+# --------------------------------------------------
+# PGN
+# --------------------------------------------------
+PGN_TEXT = """\
+[Event "First"]
+[White "A"]
+[Black "B"]
+[Result "1-0"]
+
+1. e4 {A comment over
+two lines (with a paren) and ; a semicolon} e5 2. Nf3 $1 Nc6
+(2... d6 3. d4 (3. Bc4 Be7) exd4) 3. Bb5 ; the rest of this line 4. Qxf7
+a6 1-0
+
+[Event "Second"]
+[Result "1/2-1/2"]
+
+1. d4 d5 1/2-1/2
+"""
+
+
+def test_read_games_skips_comments_variations_and_nags():
+    games = list(read_games(io.StringIO(PGN_TEXT)))
+    assert len(games) == 2
+
+    first, second = games
+    assert first.headers["Event"] == "First"
+    assert first.moves == ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6"]
+    assert first.result == "1-0"
+
+    assert second.headers["Event"] == "Second"
+    assert second.moves == ["d4", "d5"]
+    assert second.result == "1/2-1/2"
+
+
+def test_game_to_pgn_reads_back():
+    state = GameState()
+    play(state, *SPECIAL_MOVES)
+
+    text = game_to_pgn(state, {"White": "A", "Black": "B"})
+    (game,) = read_games(io.StringIO(text))
+    assert game.headers["White"] == "A"
+    assert len(game.moves) == len(SPECIAL_MOVES)
+
+    replayed = game.replay()
+    assert [move_to_uci(move) for move in replayed.move_history] == list(SPECIAL_MOVES)
+    assert replayed.zobrist_hash == state.zobrist_hash
@@ -0,0 +1,95 @@
+import pytest
+
+from game.state import GameState
+from tests.helpers import KNIGHT_SHUFFLE, play, state_from_fen
+
+
+# --------------------------------------------------
+# Repetition
+# --------------------------------------------------
+def test_knight_shuffle_threefold_repetition():
+    state = GameState()
+    play(state, *KNIGHT_SHUFFLE)
+    assert state.is_repetition()
+    assert not state.is_threefold_repetition()
+
+    play(state, *KNIGHT_SHUFFLE)
+    assert state.is_threefold_repetition()
+    assert state.get_game_status() == "Draw by threefold repetition"
+
+    state.undo_move()
+    assert not state.is_threefold_repetition()
+
+
+def test_repetition_stops_at_pawn_move():
+    state = GameState()
+    play(state, *KNIGHT_SHUFFLE)
+    play(state, "e2e3", "e7e6")
+    play(state, *KNIGHT_SHUFFLE)
+    # The start position came twice before the pawn moves, but this one
+    # only once before
+    assert state.is_repetition()
+    assert not state.is_threefold_repetition()
+
+
+# --------------------------------------------------
+# Fifty-Move Rule
+# --------------------------------------------------
+def test_halfmove_clock_counts_quiet_moves():
+    state = GameState()
+    play(state, "g1f3", "g8f6")
+    assert state.halfmove_clock == 2
+
+
+def test_halfmove_clock_resets_on_pawn_move():
+    state = GameState()
+    play(state, "g1f3", "e7e5")
+    assert state.halfmove_clock == 0
+    state.undo_move()
+    assert state.halfmove_clock == 1
+
+
+def test_halfmove_clock_resets_on_capture():
+    state = GameState()
+    play(state, "g1f3", "g8f6", "b1c3", "e7e5")
+    play(state, "f3e5")
+    assert state.halfmove_clock == 0
+    play(state, "b8c6", "c3b1")
+    assert state.halfmove_clock == 2
+    play(state, "c6e5")
+    assert state.halfmove_clock == 0
+
+
+def test_fifty_move_draw():
+    state = state_from_fen("4k3/8/8/8/8/8/8/R3K3 w - - 99 80")
+    assert not state.is_fifty_move_draw()
+    play(state, "a1a2")
+    assert state.is_fifty_move_draw()
+    assert state.get_game_status() == "Draw by fifty-move rule"
+    state.undo_move()
+    assert state.halfmove_clock == 99
+
+
+# --------------------------------------------------
+# Insufficient Material
+# --------------------------------------------------
+@pytest.mark.parametrize("fen", [
+    "4k3/8/8/8/8/8/8/4K3 w - - 0 1",  # K v K
+    "4k3/8/8/8/8/8/8/2B1K3 w - - 0 1",  # KB v K
+    "4k3/8/8/8/8/8/8/4K1n1 w - - 0 1",  # K v KN
+])
+def test_insufficient_material(fen):
+    state = state_from_fen(fen)
+    assert state.is_insufficient_material()
+    assert state.get_game_status() == "Draw by insufficient material"
+
+
+@pytest.mark.parametrize("fen", [
+    "4k3/8/8/8/8/8/8/1N2K1N1 w - - 0 1",  # KNN v K
+    "2b1k3/8/8/8/8/8/8/2B1K3 w - - 0 1",  # KB v KB
+    "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1",  # KP v K
+])
+def test_sufficient_material(fen):
+    state = state_from_fen(fen)
+    assert not state.is_insufficient_material()
+    assert state.get_game_status() == "Ongoing"
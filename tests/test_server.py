@@ -0,0 +1,116 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from game.snapshot import Snapshot
+from game.state import GameState
+from server import game_server
+from server.game_server import GameServer, MAX_DEPTH, ProtocolError, search_worker
+
+
+def start_snapshot() -> bytes:
+    return Snapshot.from_state(GameState()).to_bytes()
+
+
+def test_search_worker_stops_at_depth_before_move_time():
+    start = time.monotonic()
+    move = search_worker(start_snapshot(), 1, 30.0)
+    assert move is not None
+    assert time.monotonic() - start < 5.0
+
+
+def test_search_worker_stops_when_flag_is_raised(monkeypatch):
+    monkeypatch.setattr(game_server, "_stop_flags", [1])
+    start = time.monotonic()
+    move = search_worker(start_snapshot(), 8, 30.0, slot=0)
+    # Aborted at once, with the best guess so far
+    assert move is not None
+    assert time.monotonic() - start < 5.0
+
+
+def test_new_game_depth_is_capped_and_validated():
+    server = GameServer(workers=1)
+    try:
+        session = server._new_session({"depth": 50, "move_time": 1})
+        assert session.depth == MAX_DEPTH
+        with pytest.raises(ProtocolError):
+            server._new_session({"depth": 0})
+        with pytest.raises(ProtocolError):
+            server._new_session({"depth": "deep"})
+    finally:
+        server.shutdown()
+
+
+# --------------------------------------------------
+# Protocol
+# --------------------------------------------------
+async def send(writer: asyncio.StreamWriter, message: dict):
+    writer.write((json.dumps(message) + "\n").encode())
+    await writer.drain()
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, message: dict) -> dict:
+    await send(writer, message)
+    return json.loads(await asyncio.wait_for(reader.readline(), 30))
+
+
+async def wait_until(condition, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.05)
+    return True
+
+
+async def play_and_hang_up():
+    server = GameServer(workers=1, max_pending=2)
+    listener = await asyncio.start_server(server.handle_client, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        reply = await request(reader, writer, {"cmd": "new_game", "ai_color": "black", "depth": 1, "id": 7})
+        assert reply["ok"] and reply["id"] == 7
+        assert reply["moves"] == [] and reply["turn"] == "white"
+        game_id = reply["game_id"]
+
+        # The engine answers the human move at once
+        reply = await request(reader, writer, {"cmd": "move", "game_id": game_id, "move": "e4"})
+        assert reply["ok"]
+        assert reply["moves"] == ["e2e4", reply["ai_move"]]
+        assert reply["turn"] == "white" and reply["status"] == "Ongoing"
+
+        reply = await request(reader, writer, {"cmd": "move", "game_id": game_id, "move": "e2e5"})
+        assert reply == {"ok": False, "error": "illegal move: e2e5"}
+
+        # A second client starts a long search and hangs up
+        reader2, writer2 = await asyncio.open_connection("127.0.0.1", port)
+        await send(writer2, {"cmd": "new_game", "ai_color": "white", "depth": 8, "move_time": 20})
+        assert await wait_until(lambda: len(server.free_slots) == 1, 10)
+        (long_game,) = set(server.sessions) - {game_id}
+        writer2.close()
+        await writer2.wait_closed()
+
+        # The game is dropped and the worker stopped well before its move time
+        assert await wait_until(lambda: long_game not in server.sessions, 5)
+        assert await wait_until(lambda: len(server.free_slots) == 2, 10)
+        assert sorted(server.free_slots) == [0, 1]
+        assert game_id in server.sessions
+
+        # The worker is free again for the first client
+        reply = await request(reader, writer, {"cmd": "move", "game_id": game_id, "move": "d4"})
+        assert reply["ok"] and len(reply["moves"]) == 4
+
+        writer.close()
+        await writer.wait_closed()
+        assert await wait_until(lambda: not server.sessions, 5)
+    finally:
+        listener.close()
+        await listener.wait_closed()
+        server.shutdown()
+
+
+def test_protocol_and_cancellation_on_disconnect():
+    asyncio.run(play_and_hang_up())
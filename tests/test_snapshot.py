@@ -0,0 +1,122 @@
+import random
+
+from game.piece import Color, PieceType
+from game.state import GameState
+from game.notation import move_to_uci
+from game.snapshot import SHARED_PIECES, Snapshot
+from game import zobrist
+from tests.helpers import CASTLING, KNIGHT_SHUFFLE, POSITIONS, PROMOTIONS, play, state_from_fen
+
+
+def restore(state: GameState) -> GameState:
+    return Snapshot.from_bytes(Snapshot.from_state(state).to_bytes()).to_state()
+
+
+def legal_uci(state: GameState) -> set:
+    return {move_to_uci(move) for move in state.get_legal_moves()}
+
+
+# --------------------------------------------------
+# Round Trips
+# --------------------------------------------------
+def test_bytes_round_trip_keeps_hashes():
+    state = GameState()
+    play(state, "e2e4", "c7c5", "g1f3", "d7d6", "d2d4", "c5d4")
+    restored = restore(state)
+
+    assert restored.zobrist_hash == state.zobrist_hash
+    assert restored.pawn_hash == state.pawn_hash
+    assert restored.pawn_hash == zobrist.compute_pawn_hash(restored.board)
+    assert restored.turn == state.turn
+    assert restored.halfmove_clock == state.halfmove_clock
+    assert legal_uci(restored) == legal_uci(state)
+
+
+def test_bytes_round_trip_keeps_castling_rights():
+    state = state_from_fen(CASTLING)
+    # The h1 rook leaves and comes back: only queenside castling is left
+    play(state, "h1h2", "e8d8", "h2h1", "d8e8")
+    restored = restore(state)
+
+    assert restored.castling_rights == state.castling_rights
+    assert restored.board.get_piece((7, 7)).has_moved
+    assert not restored.board.get_piece((7, 0)).has_moved
+    assert not restored.board.get_piece((7, 4)).has_moved
+    # Black's king moved: its rooks count as moved too
+    assert restored.board.get_piece((0, 0)).has_moved
+
+    moves = legal_uci(restored)
+    assert "e1c1" in moves
+    assert "e1g1" not in moves
+    assert restored.zobrist_hash == zobrist.compute_hash(
+        restored.board, restored.turn, restored.castling_rights, restored.en_passant_target
+    )
+
+
+def test_bytes_round_trip_keeps_en_passant():
+    state = GameState()
+    play(state, "e2e4", "a7a6", "e4e5", "d7d5")
+    restored = restore(state)
+
+    assert restored.en_passant_target == state.en_passant_target == (2, 3)
+    assert "e5d6" in legal_uci(restored)
+    play(restored, "e5d6")
+    assert restored.board.get_piece((3, 3)) is None
+
+
+def test_bytes_round_trip_keeps_repetition_history():
+    state = GameState()
+    play(state, *KNIGHT_SHUFFLE)
+    restored = restore(state)
+
+    assert restored.hash_history == state.hash_history
+    assert restored.is_repetition()
+    play(restored, *KNIGHT_SHUFFLE)
+    assert restored.is_threefold_repetition()
+
+
+def test_fen_round_trips_test_positions():
+    for name, fen in POSITIONS:
+        snapshot = Snapshot.from_fen(fen)
+        assert snapshot.to_fen(int(fen.split()[-1])) == fen, name
+        assert Snapshot.from_state(snapshot.to_state()) == snapshot, name
+        assert Snapshot.from_bytes(snapshot.to_bytes()) == snapshot, name
+
+
+def test_snapshot_hash_matches_recomputation():
+    for name, fen in POSITIONS:
+        state = state_from_fen(fen)
+        assert state.zobrist_hash == zobrist.compute_hash(
+            state.board, state.turn, state.castling_rights, state.en_passant_target
+        ), name
+
+
+# --------------------------------------------------
+# Shared Pieces
+# --------------------------------------------------
+def test_shared_pieces_survive_play_on_restored_states():
+    snapshot = Snapshot.from_fen(PROMOTIONS)
+    first = snapshot.to_state()
+    second = snapshot.to_state()
+
+    # Restored states alias the same pawn, knight, bishop and queen objects
+    assert first.board.get_piece((6, 0)) is second.board.get_piece((6, 0))
+
+    rng = random.Random(0)
+    for _ in range(40):
+        moves = first.get_legal_moves()
+        if not moves:
+            break
+        first.make_move(rng.choice(moves))
+    while first.move_history:
+        first.undo_move()
+
+    # Playing on one state changed neither the other nor the shared pieces
+    assert Snapshot.from_state(first) == snapshot
+    assert Snapshot.from_state(second) == snapshot
+    for piece in SHARED_PIECES:
+        if piece is not None:
+            assert piece.has_moved
+            assert piece.type not in (PieceType.KING, PieceType.ROOK)
+    assert second.board.get_piece((6, 0)).type == PieceType.PAWN
+    assert second.board.get_piece((6, 0)).color == Color.WHITE
@@ -0,0 +1,101 @@
+"""
+Console client for the game server (server/game_server.py).
+
+    python -m ui.console_ui --port 8765
+"""
+from typing import Optional
+import argparse
+import json
+import socket
+
+from game.state import GameState
+from game.notation import parse_move
+from main import print_board
+
+
+class ServerConnection:
+    """
+    Blocking JSON-lines connection to the game server.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, unix_path: Optional[str] = None):
+        if unix_path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(unix_path)
+        else:
+            self.sock = socket.create_connection((host, port))
+        self.file = self.sock.makefile("rw", encoding="utf-8", newline="\n")
+
+    def request(self, **message) -> dict:
+        self.file.write(json.dumps(message) + "\n")
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        return json.loads(line)
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+def show(response: dict) -> GameState:
+    """
+    Rebuilds the game from the server's move list and prints it.
+    """
+    state = GameState()
+    for text in response["moves"]:
+        state.make_move(parse_move(text, state))
+    print_board(state)
+    if response.get("ai_move"):
+        print(f"AI moves {response['ai_move']}")
+    if response["status"] != "Ongoing":
+        print(response["status"])
+    return state
+
+
+def play(connection: ServerConnection, ai_color: str, depth: int, move_time: float):
+    response = connection.request(cmd="new_game", ai_color=ai_color, depth=depth, move_time=move_time)
+    if not response["ok"]:
+        print(response["error"])
+        return
+
+    game_id = response["game_id"]
+    print("Connected. Enter moves as e2e4 or Nf3, 'quit' to leave.")
+    show(response)
+
+    status = response["status"]
+    while status in ("Ongoing", "Check"):
+        user_input = input("> ").strip()
+        if user_input in ("quit", "exit"):
+            break
+
+        response = connection.request(cmd="move", game_id=game_id, move=user_input)
+        if not response["ok"]:
+            print(response["error"])
+            continue
+        show(response)
+        status = response["status"]
+
+    connection.request(cmd="close", game_id=game_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play against the Chess AI server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="connect to this Unix socket instead of TCP")
+    parser.add_argument("--ai-color", default="black", choices=["white", "black"])
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--move-time", type=float, default=2.0)
+    args = parser.parse_args()
+
+    connection = ServerConnection(args.host, args.port, args.unix)
+    try:
+        play(connection, args.ai_color, args.depth, args.move_time)
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()